@@ -26,6 +26,17 @@ load_dotenv()
 _client = None
 _max_retry_attempts = 3
 _retry_delay_seconds = 2
+# Server selection / connect timeouts. Only an explicit MONGO_TIMEOUT_MS (set by test
+# scripts so an unreachable server fails fast) overrides them; otherwise the 5s
+# server selection timeout and PyMongo's default connect timeout apply.
+_timeout_ms = os.getenv("MONGO_TIMEOUT_MS")
+_timeout_options = (
+    {"serverSelectionTimeoutMS": int(_timeout_ms), "connectTimeoutMS": int(_timeout_ms)}
+    if _timeout_ms else {"serverSelectionTimeoutMS": 5000}
+)
+# Connection pool bounds (PyMongo defaults); short-lived scripts can shrink the pool
+_max_pool_size = int(os.getenv("MONGO_MAX_POOL_SIZE", "100"))
+_min_pool_size = int(os.getenv("MONGO_MIN_POOL_SIZE", "0"))
 
 def get_mongo_client():
     """
@@ -62,7 +73,8 @@ def get_mongo_client():
                         raise InvalidURI("Invalid URI scheme: URI must begin with 'mongodb://' or 'mongodb+srv://'")
 
                 logger.info(f"Connecting to cloud MongoDB (attempt {attempt}/{_max_retry_attempts})...")
-                _client = MongoClient(uri, server_api=ServerApi('1'), serverSelectionTimeoutMS=5000)
+                _client = MongoClient(uri, server_api=ServerApi('1'), **_timeout_options,
+                                      maxPoolSize=_max_pool_size, minPoolSize=_min_pool_size)
                 # Test connection
                 _client.admin.command('ping')
                 logger.info("[SUCCESS] Connected to cloud MongoDB successfully!")
@@ -82,7 +94,8 @@ def get_mongo_client():
             try:
                 local_uri = os.getenv("MONGO_URI_LOCAL", "mongodb://localhost:27017/")
                 logger.info(f"Connecting to local MongoDB (attempt {attempt}/{_max_retry_attempts})...")
-                _client = MongoClient(local_uri, serverSelectionTimeoutMS=5000)
+                _client = MongoClient(local_uri, **_timeout_options,
+                                      maxPoolSize=_max_pool_size, minPoolSize=_min_pool_size)
                 _client.admin.command('ping')
                 logger.info("[SUCCESS] Connected to local MongoDB successfully!")
                 return _client
@@ -0,0 +1,37 @@
+#!/usr/bin/env python3
+"""
+Shared HTTP Helpers for the Check Scripts
+JSON encoding with optional orjson and pooled keep-alive request sessions
+"""
+
+import json
+import requests
+
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
+
+JSON_HEADERS = {"Content-Type": "application/json"}
+
+def dumps_json(payload):
+    """Serialize a JSON request body to bytes, using orjson when available."""
+    if HAS_ORJSON:
+        return orjson.dumps(payload)
+    return json.dumps(payload).encode('utf-8')
+
+def loads_json(body):
+    """Parse a JSON response body, using orjson when available."""
+    if HAS_ORJSON:
+        return orjson.loads(body)
+    return json.loads(body)
+
+def make_session(pool_connections=4, pool_maxsize=16):
+    """Create a requests session whose HTTP connections are pooled and kept alive."""
+    session = requests.Session()
+    session.mount("http://", requests.adapters.HTTPAdapter(
+        pool_connections=pool_connections,
+        pool_maxsize=pool_maxsize
+    ))
+    return session
@@ -100,8 +100,16 @@ class PDFChatRequest(BaseModel):
 
 class DocumentChatRequest(BaseModel):
     question: str
-    document_content: str
+    document_content: Optional[str] = None
     document_name: Optional[str] = "document"
+    file_id: Optional[str] = None  # text uploaded earlier via /api/upload/text
+    session_id: Optional[str] = None
+
+class DocumentBatchChatRequest(BaseModel):
+    questions: List[str]
+    document_content: Optional[str] = None
+    document_name: Optional[str] = "document"
+    file_id: Optional[str] = None  # text uploaded earlier via /api/upload/text
     session_id: Optional[str] = None
 
 # Global state
@@ -1632,10 +1640,54 @@ async def _fallback_pdf_chat(request: PDFChatRequest, doc_info: dict, document_n
 
     return result
 
+def _resolve_document_content(request) -> bool:
+    """Fill in request.document_content from an earlier upload when only a file_id was sent.
+
+    Returns False when the request has neither content nor a known file_id.
+    """
+    if not request.document_content:
+        if request.file_id and request.file_id in uploaded_documents:
+            request.document_content = uploaded_documents[request.file_id]["extracted_text"]
+        else:
+            return False
+    return True
+
+def _answer_document_question(pdf_reader, request: DocumentChatRequest):
+    """Load the document into pdf_reader and answer request.question.
+
+    Returns the answer and a short document summary.
+    """
+    success = pdf_reader.load_and_process_text(
+        request.document_content,
+        document_name=request.document_name
+    )
+    if not success:
+        raise Exception("LangChain document processing failed")
+
+    # Ask question using LangChain RAG
+    answer = pdf_reader.ask_question(request.question, verbose=False)
+
+    # Get document summary
+    summary = ""
+    try:
+        summary = pdf_reader.get_document_summary(max_length=150)
+    except Exception:
+        pass
+
+    return answer, summary
+
 @app.post("/api/chat/document")
 async def chat_with_document(request: DocumentChatRequest):
     """Chat with text document content using LangChain RAG."""
     try:
+        # Use previously uploaded text when the client sends a file_id instead of the content
+        if not _resolve_document_content(request):
+            return {
+                "status": "error",
+                "message": "Document not found. Please upload the document or send its content.",
+                "timestamp": datetime.now().isoformat()
+            }
+
         # Try to use LangChain for better document processing
         try:
             # Import the enhanced PDF reader for text processing
@@ -1649,43 +1701,26 @@ async def chat_with_document(request: DocumentChatRequest):
                 # Use LangChain for longer documents
                 logger.info(f"Using LangChain for document chat: {request.question}")
 
-                # Create a temporary document for processing
-                temp_doc_id = f"temp_doc_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
-
-                # Process document with LangChain
-                success = pdf_reader.load_and_process_text(
-                    request.document_content,
-                    document_name=request.document_name
+                # Process the document and ask the question off the event loop;
+                # the LangChain calls block on an LLM round trip
+                answer, summary = await asyncio.to_thread(
+                    _answer_document_question, pdf_reader, request
                 )
 
-                if success:
-                    # Ask question using LangChain RAG
-                    answer = pdf_reader.ask_question(request.question, verbose=False)
-
-                    # Get document summary
-                    summary = ""
-                    try:
-                        summary = pdf_reader.get_document_summary(max_length=150)
-                    except:
-                        pass
-
-                    result = {
-                        "status": "success",
-                        "agent_used": "langchain_document_qa",
-                        "answer": answer,
-                        "document_summary": summary,
-                        "document_name": request.document_name,
-                        "question": request.question,
-                        "chat_type": "document_langchain",
-                        "llm_powered": True,
-                        "rag_enabled": True,
-                        "timestamp": datetime.now().isoformat()
-                    }
-
-                    logger.info(f"LangChain document processing successful")
+                result = {
+                    "status": "success",
+                    "agent_used": "langchain_document_qa",
+                    "answer": answer,
+                    "document_summary": summary,
+                    "document_name": request.document_name,
+                    "question": request.question,
+                    "chat_type": "document_langchain",
+                    "llm_powered": True,
+                    "rag_enabled": True,
+                    "timestamp": datetime.now().isoformat()
+                }
 
-                else:
-                    raise Exception("LangChain document processing failed")
+                logger.info(f"LangChain document processing successful")
 
             else:
                 raise Exception("LangChain not available or document too short")
@@ -1766,6 +1801,133 @@ async def _fallback_document_chat(request: DocumentChatRequest):
 
     return result
 
+def _answer_document_questions(pdf_reader, request: DocumentBatchChatRequest):
+    """Load the document into pdf_reader and answer each question independently.
+
+    The reader's QA chain keeps conversation memory, so it is cleared before
+    every question; otherwise later answers would be conditioned on earlier
+    ones and differ from separate /api/chat/document calls.
+    Returns the answers in question order and a short document summary.
+    """
+    success = pdf_reader.load_and_process_text(
+        request.document_content,
+        document_name=request.document_name
+    )
+    if not success:
+        raise Exception("LangChain document processing failed")
+
+    answers = []
+    for question in request.questions:
+        if pdf_reader.memory:
+            pdf_reader.memory.clear()
+        answers.append(pdf_reader.ask_question(question, verbose=False))
+
+    # Get document summary, as /api/chat/document does
+    summary = ""
+    try:
+        if pdf_reader.memory:
+            pdf_reader.memory.clear()
+        summary = pdf_reader.get_document_summary(max_length=150)
+    except Exception:
+        pass
+
+    return answers, summary
+
+@app.post("/api/chat/document/batch")
+async def chat_with_document_batch(request: DocumentBatchChatRequest):
+    """Answer several questions about one text document in a single request.
+
+    The document is processed by LangChain once and every question is asked
+    against it, instead of re-processing it for each /api/chat/document call.
+    """
+    try:
+        # Use previously uploaded text when the client sends a file_id instead of the content
+        if not _resolve_document_content(request):
+            return {
+                "status": "error",
+                "message": "Document not found. Please upload the document or send its content.",
+                "timestamp": datetime.now().isoformat()
+            }
+
+        try:
+            # Import the enhanced PDF reader for text processing
+            sys.path.insert(0, str(Path(__file__).parent / "data" / "multimodal"))
+            from pdf_reader import EnhancedPDFReader
+
+            pdf_reader = EnhancedPDFReader()
+
+            if pdf_reader.llm and len(request.document_content) > 500:
+                logger.info(f"Using LangChain for batch document chat: {len(request.questions)} questions")
+
+                # Load the document once and ask every question off the event loop;
+                # each LangChain call blocks on an LLM round trip
+                answer_texts, summary = await asyncio.to_thread(
+                    _answer_document_questions, pdf_reader, request
+                )
+
+                answers = [
+                    {
+                        "status": "success",
+                        "agent_used": "langchain_document_qa",
+                        "answer": answer,
+                        "document_summary": summary,
+                        "document_name": request.document_name,
+                        "question": question,
+                        "chat_type": "document_langchain",
+                        "llm_powered": True,
+                        "rag_enabled": True,
+                        "timestamp": datetime.now().isoformat()
+                    }
+                    for question, answer in zip(request.questions, answer_texts)
+                ]
+
+            else:
+                raise Exception("LangChain not available or document too short")
+
+        except Exception as e:
+            logger.warning(f"LangChain batch document processing failed: {e}")
+            # Fallback to basic processing; the questions are independent, so run them together
+            answers = await asyncio.gather(*(
+                _fallback_document_chat(DocumentChatRequest(
+                    question=question,
+                    document_content=request.document_content,
+                    document_name=request.document_name
+                ))
+                for question in request.questions
+            ))
+            for result in answers:
+                result["fallback_reason"] = f"LangChain error: {str(e)}"
+
+        # Store chat session
+        if request.session_id:
+            if request.session_id not in chat_sessions:
+                chat_sessions[request.session_id] = []
+            chat_sessions[request.session_id].extend(
+                {
+                    "question": question,
+                    "answer": result,
+                    "timestamp": datetime.now().isoformat(),
+                    "document_name": request.document_name
+                }
+                for question, result in zip(request.questions, answers)
+            )
+
+        return {
+            "status": "success",
+            "answers": answers,
+            "document_name": request.document_name,
+            "total_questions": len(request.questions),
+            "timestamp": datetime.now().isoformat()
+        }
+
+    except Exception as e:
+        logger.error(f"Batch document chat error: {e}")
+        return {
+            "status": "error",
+            "message": f"Batch chat failed: {str(e)}",
+            "timestamp": datetime.now().isoformat()
+        }
+
 @app.get("/api/documents")
 async def list_uploaded_documents():
     """List all uploaded documents."""
@@ -4,6 +4,7 @@ Simple Interactive Chatbot Demo
 Demonstrates the intelligent chatbot with conditional logic and multi-agent coordination
 """
 
+import sys
 import requests
 import json
 from datetime import datetime
@@ -36,7 +37,11 @@ class SimpleChatbotDemo:
         
         while True:
             try:
-                user_input = input("\n🎯 You: ").strip()
+                user_input = self.read_user_input("\n🎯 You: ")
+                
+                if user_input is None:
+                    print("\n👋 Goodbye!")
+                    break
                 
                 if user_input.lower() in ['quit', 'exit', 'bye']:
                     print("👋 Goodbye! Have a great day!")
@@ -62,6 +67,19 @@ class SimpleChatbotDemo:
             except Exception as e:
                 print(f"\n❌ Error: {e}")
     
+    def read_user_input(self, prompt):
+        """Read one line of user input, or None at end of input."""
+        if sys.stdin.isatty():
+            return input(prompt).strip()
+        
+        # Scripted/piped input: write the prompt ourselves and skip readline
+        sys.stdout.write(prompt)
+        sys.stdout.flush()
+        line = sys.stdin.readline()
+        if not line:
+            return None
+        return line.strip()
+    
     def process_input(self, user_input):
         """Process user input and get response."""
         try:
@@ -18,26 +18,32 @@ def test_image_exists():
     print(f"🔍 Looking for: {image_path.name}")
     print(f"📂 In directory: {image_path.parent}")
     
-    if image_path.exists():
-        print("✅ Image file found!")
-        
-        # Get file info
-        file_size = image_path.stat().st_size
-        print(f"📊 File size: {file_size:,} bytes ({file_size/1024:.1f} KB)")
-        print(f"📝 File type: {image_path.suffix}")
-        
-        return str(image_path)
-    else:
+    try:
+        # One stat() call covers both the existence check and the size
+        file_stat = image_path.stat()
+    except FileNotFoundError:
         print("❌ Image file not found!")
         
-        # Check directory contents
-        if image_path.parent.exists():
-            print(f"\n📋 Files in {image_path.parent.name}:")
-            for file in image_path.parent.iterdir():
-                if file.is_file():
-                    print(f"   • {file.name}")
+        # Check directory contents (DirEntry caches its stat result)
+        try:
+            with os.scandir(image_path.parent) as entries:
+                print(f"\n📋 Files in {image_path.parent.name}:")
+                for entry in entries:
+                    if entry.is_file():
+                        print(f"   • {entry.name}")
+        except FileNotFoundError:
+            pass
         
         return None
+    
+    print("✅ Image file found!")
+    
+    # Get file info
+    file_size = file_stat.st_size
+    print(f"📊 File size: {file_size:,} bytes ({file_size/1024:.1f} KB)")
+    print(f"📝 File type: {image_path.suffix}")
+    
+    return str(image_path)
 
 def test_direct_ocr(image_path):
     """Test direct OCR on the image."""
@@ -5,12 +5,80 @@ Test OCR functionality with the specific image file
 """
 
 import os
+import re
 import sys
+import time
 import base64
-import requests
+import functools
+import hashlib
+import importlib.util
+import numpy as np
 from pathlib import Path
 from datetime import datetime
 
+from check_http import JSON_HEADERS, dumps_json, loads_json, make_session
+
+# Shared HTTP session so every probe reuses the keep-alive connection
+_SESSION = make_session(pool_connections=16, pool_maxsize=16)
+
+@functools.lru_cache(maxsize=32)
+def _load_b64(path, mtime, size):
+    """Read an image and base64-encode it, cached per (path, mtime, size)."""
+    # Only the encoded bytes are kept so the raw image is freed right away.
+    # They stay as bytes so the request body can be spliced without a
+    # decode/encode round trip.
+    with open(path, 'rb') as f:
+        return base64.b64encode(memoryview(f.read()))
+
+# OCR results are cached next to this script; set MCP_TEST_OCR_CACHE=0 or pass
+# --no-ocr-cache to run OCR for real every time
+OCR_CACHE_DIR = Path(__file__).parent / ".ocr_cache"
+OCR_CACHE_ENABLED = os.getenv('MCP_TEST_OCR_CACHE', '1') != '0'
+
+OCR_MODULE_PATH = Path(__file__).parent / "data" / "multimodal" / "image_ocr.py"
+
+@functools.lru_cache(maxsize=1)
+def _get_ocr():
+    """Load the image_ocr module straight from its file, once per process."""
+    spec = importlib.util.spec_from_file_location("image_ocr", OCR_MODULE_PATH)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+QUOTE_KEYWORDS = ("black", "white", "nothing", "color", "quote")
+
+# Longest alternative first so "dave matthews" wins over its parts
+_KEYWORD_PATTERN = re.compile("|".join(("dave matthews", "dave", "matthews") + QUOTE_KEYWORDS))
+
+def _ocr_cached(extract_text_from_image, image_path, **params):
+    """Run OCR on an image, reusing the on-disk result for identical bytes and parameters.
+    
+    Returns (text, from_cache). With the cache disabled OCR always runs and
+    nothing is read from or written to disk.
+    """
+    if not OCR_CACHE_ENABLED:
+        return extract_text_from_image(image_path, **params), False
+    
+    key_source = Path(image_path).read_bytes() + repr(sorted(params.items())).encode()
+    key = hashlib.blake2b(key_source, digest_size=16).hexdigest()
+    cache_file = OCR_CACHE_DIR / f"{key}.txt"
+    
+    try:
+        return cache_file.read_text(encoding='utf-8'), True
+    except FileNotFoundError:
+        pass
+    
+    extracted_text = extract_text_from_image(image_path, **params)
+    
+    # Error messages are not cached so the next run retries
+    if extracted_text and not extracted_text.startswith("❌"):
+        OCR_CACHE_DIR.mkdir(exist_ok=True)
+        tmp_file = cache_file.with_suffix(f".{os.getpid()}.tmp")
+        tmp_file.write_text(extracted_text, encoding='utf-8')
+        os.replace(tmp_file, cache_file)
+    
+    return extracted_text, False
+
 def test_image_file_exists():
     """Check if the test image file exists."""
     print("📁 CHECKING IMAGE FILE")
@@ -20,17 +88,9 @@ def test_image_file_exists():
     
     print(f"🔍 Looking for: {image_path}")
     
-    if image_path.exists():
-        print("✅ Image file found!")
-        
-        # Get file info
-        file_size = image_path.stat().st_size
-        print(f"📊 File size: {file_size:,} bytes ({file_size/1024:.1f} KB)")
-        print(f"📝 File extension: {image_path.suffix}")
-        print(f"📂 Directory: {image_path.parent}")
-        
-        return str(image_path)
-    else:
+    try:
+        file_stat = image_path.stat()
+    except FileNotFoundError:
         print("❌ Image file not found!")
         
         # Check if directory exists
@@ -44,28 +104,41 @@ def test_image_file_exists():
             print(f"❌ Directory doesn't exist: {image_path.parent}")
         
         return None
+    
+    print("✅ Image file found!")
+    
+    # Get file info
+    file_size = file_stat.st_size
+    print(f"📊 File size: {file_size:,} bytes ({file_size/1024:.1f} KB)")
+    print(f"📝 File extension: {image_path.suffix}")
+    print(f"📂 Directory: {image_path.parent}")
+    
+    return str(image_path)
 
-def test_direct_ocr_module(image_path):
+def test_direct_ocr_module(image_path, image_name=None):
     """Test OCR module directly with the image."""
+    image_name = image_name or os.path.basename(image_path)
     print("\n🔧 TESTING DIRECT OCR MODULE")
     print("=" * 50)
     
     try:
-        # Add the multimodal directory to path
-        sys.path.append('data/multimodal')
-        from image_ocr import extract_text_from_image
+        extract_text_from_image = _get_ocr().extract_text_from_image
         
-        print(f"📸 Processing image: {Path(image_path).name}")
+        print(f"📸 Processing image: {image_name}")
         print("⏳ Extracting text...")
         
         # Extract text with debug mode
-        extracted_text = extract_text_from_image(
+        extracted_text, from_cache = _ocr_cached(
+            extract_text_from_image,
             image_path,
             debug=True,
             preprocessing_level=2,
             try_multiple_methods=True
         )
         
+        if from_cache:
+            print("♻️ Using cached OCR result (set MCP_TEST_OCR_CACHE=0 or pass --no-ocr-cache to rerun OCR)")
+        
         print("\n📝 EXTRACTED TEXT:")
         print("=" * 40)
         print(extracted_text)
@@ -80,13 +153,13 @@ def test_direct_ocr_module(image_path):
         if "black" in extracted_text.lower() and "white" in extracted_text.lower():
             print("✅ Quote keywords detected!")
         
-        return extracted_text
+        return extracted_text, from_cache
         
     except Exception as e:
         print(f"❌ OCR module error: {e}")
-        return None
+        return None, False
 
-def test_document_processor_agent(image_path):
+async def test_document_processor_agent(image_path):
     """Test document processor agent with the image."""
     print("\n📄 TESTING DOCUMENT PROCESSOR AGENT")
     print("=" * 50)
@@ -103,7 +176,7 @@ def test_document_processor_agent(image_path):
         
         # Create message for image processing
         message = MCPMessage(
-            id=f"image_test_{datetime.now().timestamp()}",
+            id=f"image_test_{time.monotonic_ns()}",
             method="process",
             params={
                 "file_path": image_path,
@@ -142,38 +215,38 @@ def test_document_processor_agent(image_path):
         print(f"❌ Document processor error: {e}")
         return None
 
-def test_mcp_server_api(image_path):
+def test_mcp_server_api(image_path, image_name=None):
     """Test MCP server API with the image."""
+    image_name = image_name or os.path.basename(image_path)
     print("\n🌐 TESTING MCP SERVER API")
     print("=" * 50)
     
     try:
-        # Read image file and encode to base64
-        with open(image_path, 'rb') as f:
-            image_data = f.read()
-        
-        image_base64 = base64.b64encode(image_data).decode('utf-8')
+        # Read image file and encode to base64 (reused while the file is unchanged)
+        file_stat = Path(image_path).stat()
+        image_base64 = _load_b64(str(image_path), file_stat.st_mtime, file_stat.st_size)
         print(f"📸 Image encoded: {len(image_base64)} characters")
         
+        # Base64 needs no JSON escaping, so the encoded bytes go into the
+        # body as-is
+        body = (
+            b'{"documents":[{"filename":' + dumps_json(image_name)
+            + b',"content":"' + image_base64
+            + b'","type":"image"}],"query":'
+            + dumps_json("Extract all text from this Dave Matthews quote image")
+            + b',"rag_mode":true}'
+        )
+        
         # Send to MCP server
-        response = requests.post(
+        response = _SESSION.post(
             "http://localhost:8000/api/mcp/analyze",
-            json={
-                "documents": [
-                    {
-                        "filename": Path(image_path).name,
-                        "content": image_base64,
-                        "type": "image"
-                    }
-                ],
-                "query": "Extract all text from this Dave Matthews quote image",
-                "rag_mode": True
-            },
+            data=body,
+            headers=JSON_HEADERS,
             timeout=30
         )
         
         if response.status_code == 200:
-            result = response.json()
+            result = loads_json(response.content)
             print(f"✅ Server response: {result.get('status', 'unknown')}")
             
             if result.get('status') == 'success':
@@ -203,14 +276,15 @@ def test_mcp_command_interface(image_path):
         # Test with natural language command
         command = f"Extract text from the image at {image_path}"
         
-        response = requests.post(
+        response = _SESSION.post(
             "http://localhost:8000/api/mcp/command",
-            json={"command": command},
+            data=dumps_json({"command": command}),
+            headers=JSON_HEADERS,
             timeout=20
         )
         
         if response.status_code == 200:
-            result = response.json()
+            result = loads_json(response.content)
             print(f"✅ Command response: {result.get('status', 'unknown')}")
             print(f"💬 Message: {result.get('message', 'No message')}")
             print(f"🤖 Agent: {result.get('agent_used', 'unknown')}")
@@ -233,19 +307,19 @@ def analyze_extracted_text(text):
         print("❌ No text to analyze")
         return
     
-    text_lower = text.lower()
+    # Collect every keyword hit in a single pass over the text
+    hits = set(_KEYWORD_PATTERN.findall(text.lower()))
     
     # Check for Dave Matthews
-    if "dave matthews" in text_lower:
+    if "dave matthews" in hits:
         print("✅ Dave Matthews name detected")
-    elif "dave" in text_lower and "matthews" in text_lower:
+    elif "dave" in hits and "matthews" in hits:
         print("✅ Dave Matthews name detected (separate words)")
     else:
         print("⚠️ Dave Matthews name not clearly detected")
     
     # Check for quote keywords
-    quote_keywords = ["black", "white", "nothing", "color", "quote"]
-    detected_keywords = [word for word in quote_keywords if word in text_lower]
+    detected_keywords = [word for word in QUOTE_KEYWORDS if word in hits]
     
     if detected_keywords:
         print(f"✅ Quote keywords detected: {', '.join(detected_keywords)}")
@@ -253,17 +327,22 @@ def analyze_extracted_text(text):
         print("⚠️ Quote keywords not clearly detected")
     
     # Check for common OCR issues
-    if len(text) < 10:
+    text_length = len(text)
+    if text_length < 10:
         print("⚠️ Very short text - possible OCR issue")
-    elif len(text) > 1000:
+    elif text_length > 1000:
         print("⚠️ Very long text - possible over-extraction")
     else:
-        print(f"✅ Text length reasonable: {len(text)} characters")
+        print(f"✅ Text length reasonable: {text_length} characters")
     
     # Word analysis
     words = text.split()
     print(f"📊 Word count: {len(words)}")
-    print(f"📊 Average word length: {sum(len(word) for word in words) / len(words):.1f}" if words else "N/A")
+    if words:
+        word_lengths = np.fromiter(map(len, words), dtype=np.int32, count=len(words))
+        print(f"📊 Average word length: {word_lengths.mean():.1f}")
+    else:
+        print("N/A")
 
 async def main():
     """Main test function."""
@@ -280,14 +359,16 @@ async def main():
         print("💡 Please check the file path and try again")
         return False
     
+    image_name = os.path.basename(image_path)
+    
     # Step 2: Test direct OCR module
-    ocr_text = test_direct_ocr_module(image_path)
+    ocr_text, ocr_from_cache = test_direct_ocr_module(image_path, image_name)
     
     # Step 3: Test document processor agent
-    # agent_text = test_document_processor_agent(image_path)
+    # agent_text = await test_document_processor_agent(image_path)
     
     # Step 4: Test MCP server API
-    api_text = test_mcp_server_api(image_path)
+    api_text = test_mcp_server_api(image_path, image_name)
     
     # Step 5: Test MCP command interface
     command_success = test_mcp_command_interface(image_path)
@@ -299,7 +380,7 @@ async def main():
     
     results = {
         "Image file found": image_path is not None,
-        "Direct OCR module": ocr_text is not None,
+        "Direct OCR module (cached result)" if ocr_from_cache else "Direct OCR module": ocr_text is not None,
         "MCP server API": api_text is not None,
         "Command interface": command_success
     }
@@ -330,8 +411,15 @@ async def main():
     return success_count >= 2
 
 if __name__ == "__main__":
+    import argparse
     import asyncio
     
+    parser = argparse.ArgumentParser(description="Dave Matthews image OCR test")
+    parser.add_argument("--no-ocr-cache", action="store_true",
+                        help="run OCR even when a cached result exists")
+    if parser.parse_args().no_ocr_cache:
+        OCR_CACHE_ENABLED = False
+    
     try:
         success = asyncio.run(main())
         if success:
@@ -5,10 +5,11 @@ Comprehensive testing of each component individually
 """
 
 import asyncio
-import requests
-import json
+import aiohttp
+import contextlib
 import sys
 import os
+import time
 from datetime import datetime
 from pathlib import Path
 
@@ -16,229 +17,320 @@ from pathlib import Path
 sys.path.insert(0, str(Path(__file__).parent))
 sys.path.insert(0, str(Path(__file__).parent / "agents"))
 
+from check_http import JSON_HEADERS, dumps_json, loads_json
+
+# Oversized command for the error-handling probe, built once
+_LONG_CMD = "A" * 1000
+
+# Summary categories: exact result keys first, then key prefixes
+_CATEGORY_BY_KEY = {
+    "mongodb_connection": "Infrastructure",
+    "inter_agent_communication": "Infrastructure",
+    "multi_agent_coordination": "Advanced Features",
+    "error_handling": "Advanced Features"
+}
+_CATEGORY_BY_PREFIX = (("server_", "Server"), ("agent_", "Agents"))
+
+# (name, commands to try in order, expected agent)
+_AGENT_TESTS = (
+    ("Math Agent",
+     ("Calculate 20% of 500", "What is 15 + 25?", "Compute 100 / 4"),
+     "math_agent"),
+    ("Weather Agent",
+     ("What is the weather in Mumbai?", "Mumbai weather", "Temperature in Delhi"),
+     "weather_agent"),
+    ("Document Agent",
+     ("Analyze this text: Hello world", "Process document content", "Extract text information"),
+     "document_agent"),
+    ("Gmail Agent (Inactive)",
+     ("Send email to test@example.com", "Email notification"),
+     "gmail_agent"),
+    ("Calendar Agent (Inactive)",
+     ("Create reminder for tomorrow", "Schedule meeting"),
+     "calendar_agent")
+)
+
 class IndividualComponentTester:
     """Test each component individually."""
     
     def __init__(self):
         self.base_url = "http://localhost:8000"
         self.test_results = {}
+        self.session = None
+        
+        # Connected handles kept for reuse when the suite runs again
+        self.mongo_integration = None
+        self.agent_hub = None
+        
+        # Report lines buffered by _p() and written out by _flush()
+        self._buf = []
+        
+        # Wall-clock nanoseconds spent in each probe group
+        self._timings = {}
+    
+    def _p(self, *args):
+        """Buffer a report line instead of printing it immediately."""
+        self._buf.append(" ".join(map(str, args)))
+    
+    def _flush(self):
+        """Write all buffered report lines with a single stdout write."""
+        if self._buf:
+            sys.stdout.write("\n".join(self._buf))
+            sys.stdout.write("\n")
+            sys.stdout.flush()
+            self._buf.clear()
+    
+    def close(self):
+        """Release the MongoDB connection held by the tester."""
+        if self.mongo_integration is not None and self.mongo_integration.client is not None:
+            self.mongo_integration.client.close()
+        self.mongo_integration = None
+        self.agent_hub = None
     
-    def test_server_basic_functionality(self):
+    @contextlib.asynccontextmanager
+    async def _probe(self, key, label=None):
+        """Time a probe group; with a label, an error marks result `key` as failed."""
+        start = time.perf_counter_ns()
+        try:
+            yield
+        except Exception as e:
+            if label is None:
+                raise
+            self._p(f"   ❌ {label}: Error - {e}")
+            self.test_results[key] = False
+        finally:
+            self._timings[key] = time.perf_counter_ns() - start
+            # Emit the section's buffered lines (and any error) in order, even on failure
+            self._flush()
+    
+    async def _fetch(self, method, url, timeout, parse_json=True, payload=None):
+        """Send a request on the shared session and return (status, JSON body or None)."""
+        kwargs = {}
+        if payload is not None:
+            kwargs = {"data": dumps_json(payload), "headers": JSON_HEADERS}
+        
+        async with self.session.request(
+            method, url, timeout=aiohttp.ClientTimeout(total=timeout), **kwargs
+        ) as response:
+            if response.status == 200 and parse_json:
+                return response.status, loads_json(await response.read())
+            return response.status, None
+    
+    async def test_server_basic_functionality(self):
         """Test basic server functionality."""
         print("🚀 TESTING SERVER BASIC FUNCTIONALITY")
         print("=" * 60)
         
+        # (name, url, whether the body is read); the other endpoints
+        # only need a status code
         tests = [
-            ("Health Check", f"{self.base_url}/api/health"),
-            ("Agent List", f"{self.base_url}/api/agents"),
-            ("Inter-Agent Status", f"{self.base_url}/api/inter-agent/status"),
-            ("API Documentation", f"{self.base_url}/docs")
+            ("Health Check", f"{self.base_url}/api/health", True),
+            ("Agent List", f"{self.base_url}/api/agents", True),
+            ("Inter-Agent Status", f"{self.base_url}/api/inter-agent/status", False),
+            ("API Documentation", f"{self.base_url}/docs", False)
         ]
         
-        for test_name, url in tests:
+        # The probes are independent, so fire them all at once
+        responses = await asyncio.gather(
+            *(self._fetch("GET", url, 5, parse_json=parse_json) for _, url, parse_json in tests),
+            return_exceptions=True
+        )
+        
+        for (test_name, url, _), response in zip(tests, responses):
             print(f"\n🔍 Testing {test_name}: {url}")
             
             try:
-                response = requests.get(url, timeout=5)
+                if isinstance(response, Exception):
+                    raise response
+                
+                status_code, body = response
                 
-                if response.status_code == 200:
+                if status_code == 200:
                     print(f"   ✅ {test_name}: Working")
                     
                     if "health" in url:
-                        health = response.json()
+                        health = body
                         print(f"      Server Ready: {health.get('ready', False)}")
                         print(f"      Agents Loaded: {health.get('agents_loaded', 0)}")
                         print(f"      MongoDB Connected: {health.get('mongodb_connected', False)}")
                         print(f"      Inter-Agent Communication: {health.get('inter_agent_communication', False)}")
                     
                     elif "agents" in url:
-                        agents = response.json()
+                        agents = body
                         print(f"      Total Agents: {agents.get('total_agents', 0)}")
                         print(f"      Agent List: {list(agents.get('agents', {}).keys())}")
                     
                     self.test_results[f'server_{test_name.lower().replace(" ", "_")}'] = True
                 else:
-                    print(f"   ❌ {test_name}: HTTP {response.status_code}")
+                    print(f"   ❌ {test_name}: HTTP {status_code}")
                     self.test_results[f'server_{test_name.lower().replace(" ", "_")}'] = False
                     
             except Exception as e:
                 print(f"   ❌ {test_name}: Error - {e}")
                 self.test_results[f'server_{test_name.lower().replace(" ", "_")}'] = False
     
-    def test_individual_agents(self):
+    async def _post_command(self, command, timeout):
+        """POST a command to the MCP command endpoint."""
+        return await self._fetch(
+            "POST", f"{self.base_url}/api/mcp/command", timeout, payload={"command": command}
+        )
+    
+    async def test_individual_agents(self):
         """Test each agent individually."""
-        print("\n🤖 TESTING INDIVIDUAL AGENTS")
-        print("=" * 60)
+        self._p("\n🤖 TESTING INDIVIDUAL AGENTS")
+        self._p("=" * 60)
         
-        agent_tests = [
-            {
-                "name": "Math Agent",
-                "commands": [
-                    "Calculate 20% of 500",
-                    "What is 15 + 25?",
-                    "Compute 100 / 4"
-                ],
-                "expected_agent": "math_agent"
-            },
-            {
-                "name": "Weather Agent", 
-                "commands": [
-                    "What is the weather in Mumbai?",
-                    "Mumbai weather",
-                    "Temperature in Delhi"
-                ],
-                "expected_agent": "weather_agent"
-            },
-            {
-                "name": "Document Agent",
-                "commands": [
-                    "Analyze this text: Hello world",
-                    "Process document content",
-                    "Extract text information"
-                ],
-                "expected_agent": "document_agent"
-            },
-            {
-                "name": "Gmail Agent (Inactive)",
-                "commands": [
-                    "Send email to test@example.com",
-                    "Email notification"
-                ],
-                "expected_agent": "gmail_agent"
-            },
-            {
-                "name": "Calendar Agent (Inactive)",
-                "commands": [
-                    "Create reminder for tomorrow",
-                    "Schedule meeting"
-                ],
-                "expected_agent": "calendar_agent"
-            }
-        ]
+        # Each round concurrently sends the next command for every agent
+        # that has not succeeded yet
+        attempts = [[] for _ in _AGENT_TESTS]
+        pending = list(range(len(_AGENT_TESTS)))
+        round_index = 0
+        
+        while pending:
+            commands = [_AGENT_TESTS[i][1][round_index] for i in pending]
+            responses = await asyncio.gather(
+                *(self._post_command(command, 15) for command in commands),
+                return_exceptions=True
+            )
+            
+            retry = []
+            for i, command, response in zip(pending, commands, responses):
+                attempts[i].append((command, response))
+                
+                succeeded = (
+                    not isinstance(response, Exception)
+                    and response[0] == 200
+                    and isinstance(response[1], dict)
+                    and response[1].get("status") == "success"
+                )
+                if not succeeded and round_index + 1 < len(_AGENT_TESTS[i][1]):
+                    retry.append(i)
+            
+            pending = retry
+            round_index += 1
         
-        for agent_test in agent_tests:
-            print(f"\n🔍 Testing {agent_test['name']}")
-            print("-" * 40)
+        for (name, _, expected_agent), agent_attempts in zip(_AGENT_TESTS, attempts):
+            self._p(f"\n🔍 Testing {name}")
+            self._p("-" * 40)
             
             agent_working = False
             
-            for command in agent_test['commands']:
-                print(f"   📤 Command: {command}")
+            for command, response in agent_attempts:
+                self._p(f"   📤 Command: {command}")
                 
                 try:
-                    response = requests.post(
-                        f"{self.base_url}/api/mcp/command",
-                        json={"command": command},
-                        timeout=15
-                    )
+                    if isinstance(response, Exception):
+                        raise response
                     
-                    if response.status_code == 200:
-                        result = response.json()
-                        
+                    status_code, result = response
+                    
+                    if status_code == 200:
                         status = result.get("status", "unknown")
                         agent_used = result.get("agent_used", "unknown")
                         stored = result.get("stored_in_mongodb", False)
                         
-                        print(f"      ✅ Status: {status}")
-                        print(f"      🤖 Agent Used: {agent_used}")
-                        print(f"      💾 MongoDB Stored: {stored}")
+                        self._p(f"      ✅ Status: {status}")
+                        self._p(f"      🤖 Agent Used: {agent_used}")
+                        self._p(f"      💾 MongoDB Stored: {stored}")
                         
                         if "result" in result:
-                            print(f"      📊 Result: {result['result']}")
+                            self._p(f"      📊 Result: {result['result']}")
                         elif "city" in result:
-                            print(f"      🌍 City: {result['city']}")
+                            self._p(f"      🌍 City: {result['city']}")
                         elif "message" in result:
-                            print(f"      💬 Message: {result['message'][:50]}...")
+                            self._p(f"      💬 Message: {result['message'][:50]}...")
                         
                         if status == "success":
                             agent_working = True
-                        
-                        break  # Test only first command for each agent
                     else:
-                        print(f"      ❌ HTTP Error: {response.status_code}")
+                        self._p(f"      ❌ HTTP Error: {status_code}")
                         
                 except Exception as e:
-                    print(f"      ❌ Error: {e}")
+                    self._p(f"      ❌ Error: {e}")
             
-            self.test_results[f'agent_{agent_test["expected_agent"]}'] = agent_working
+            self.test_results[f'agent_{expected_agent}'] = agent_working
+        
+        self._flush()
     
-    def test_mongodb_storage_individually(self):
+    async def test_mongodb_storage_individually(self):
         """Test MongoDB storage functionality individually."""
         print("\n💾 TESTING MONGODB STORAGE INDIVIDUALLY")
         print("=" * 60)
         
         # Test MongoDB connection
         print("🔍 Testing MongoDB Connection")
-        try:
-            from mcp_mongodb_integration import MCPMongoDBIntegration
+        from mcp_mongodb_integration import MCPMongoDBIntegration
+        
+        async def test_mongodb():
+            integration = self.mongo_integration
+            connected = integration is not None
             
-            async def test_mongodb():
+            if not connected:
                 integration = MCPMongoDBIntegration()
                 connected = await integration.connect()
-                
                 if connected:
-                    print("   ✅ MongoDB Connection: Working")
-                    
-                    # Test basic storage
-                    try:
-                        test_id = await integration.save_agent_output(
-                            "test_agent",
-                            {"test": "input"},
-                            {"test": "output"},
-                            {"test": "metadata"}
-                        )
-                        print(f"   ✅ MongoDB Storage: Working (ID: {test_id})")
-                        return True
-                    except Exception as e:
-                        print(f"   ❌ MongoDB Storage: Failed - {e}")
-                        return False
-                else:
-                    print("   ❌ MongoDB Connection: Failed")
-                    return False
-            
-            mongodb_working = asyncio.run(test_mongodb())
-            self.test_results['mongodb_connection'] = mongodb_working
+                    self.mongo_integration = integration
             
-        except Exception as e:
-            print(f"   ❌ MongoDB Test: Error - {e}")
-            self.test_results['mongodb_connection'] = False
+            if connected:
+                print("   ✅ MongoDB Connection: Working")
+                
+                # Test basic storage
+                try:
+                    test_id = await integration.save_agent_output(
+                        "test_agent",
+                        {"test": "input"},
+                        {"test": "output"},
+                        {"test": "metadata"}
+                    )
+                    print(f"   ✅ MongoDB Storage: Working (ID: {test_id})")
+                    return True
+                except Exception as e:
+                    print(f"   ❌ MongoDB Storage: Failed - {e}")
+                    return False
+            else:
+                print("   ❌ MongoDB Connection: Failed")
+                return False
+        
+        mongodb_working = await test_mongodb()
+        self.test_results['mongodb_connection'] = mongodb_working
     
-    def test_inter_agent_communication_individually(self):
+    async def test_inter_agent_communication_individually(self):
         """Test inter-agent communication individually."""
         print("\n🔗 TESTING INTER-AGENT COMMUNICATION INDIVIDUALLY")
         print("=" * 60)
         
         # Test inter-agent system initialization
         print("🔍 Testing Inter-Agent System")
-        try:
-            from inter_agent_communication import AgentCommunicationHub
+        from inter_agent_communication import AgentCommunicationHub
+        
+        async def test_inter_agent():
+            hub = self.agent_hub
+            initialized = hub is not None
             
-            async def test_inter_agent():
+            if not initialized:
                 hub = AgentCommunicationHub()
                 initialized = await hub.initialize_system()
-                
                 if initialized:
-                    print("   ✅ Inter-Agent System: Working")
-                    
-                    # Test system status
-                    status = hub.get_system_status()
-                    print(f"      Active Agents: {status.get('active_agents', 0)}")
-                    print(f"      Inactive Agents: {status.get('inactive_agents', 0)}")
-                    print(f"      MongoDB Connected: {status.get('mongodb_connected', False)}")
-                    
-                    return True
-                else:
-                    print("   ❌ Inter-Agent System: Failed to initialize")
-                    return False
+                    self.agent_hub = hub
             
-            inter_agent_working = asyncio.run(test_inter_agent())
-            self.test_results['inter_agent_communication'] = inter_agent_working
-            
-        except Exception as e:
-            print(f"   ❌ Inter-Agent Test: Error - {e}")
-            self.test_results['inter_agent_communication'] = False
+            if initialized:
+                print("   ✅ Inter-Agent System: Working")
+                
+                # Test system status
+                status = hub.get_system_status()
+                print(f"      Active Agents: {status.get('active_agents', 0)}")
+                print(f"      Inactive Agents: {status.get('inactive_agents', 0)}")
+                print(f"      MongoDB Connected: {status.get('mongodb_connected', False)}")
+                
+                return True
+            else:
+                print("   ❌ Inter-Agent System: Failed to initialize")
+                return False
+        
+        inter_agent_working = await test_inter_agent()
+        self.test_results['inter_agent_communication'] = inter_agent_working
     
-    def test_multi_agent_coordination_individually(self):
+    async def test_multi_agent_coordination_individually(self):
         """Test multi-agent coordination individually."""
         print("\n🎯 TESTING MULTI-AGENT COORDINATION INDIVIDUALLY")
         print("=" * 60)
@@ -255,15 +347,9 @@ class IndividualComponentTester:
             
             try:
                 # Test automatic coordination
-                response = requests.post(
-                    f"{self.base_url}/api/mcp/command",
-                    json={"command": command},
-                    timeout=20
-                )
+                status_code, result = await self._post_command(command, 20)
                 
-                if response.status_code == 200:
-                    result = response.json()
-                    
+                if status_code == 200:
                     status = result.get("status", "unknown")
                     agent_used = result.get("agent_used", "unknown")
                     
@@ -278,7 +364,7 @@ class IndividualComponentTester:
                     
                     break  # Test only first command
                 else:
-                    print(f"   ❌ HTTP Error: {response.status_code}")
+                    print(f"   ❌ HTTP Error: {status_code}")
                     
             except Exception as e:
                 print(f"   ❌ Error: {e}")
@@ -286,110 +372,130 @@ class IndividualComponentTester:
         # Test direct coordination endpoint
         print(f"\n📤 Testing Direct Coordination Endpoint")
         try:
-            response = requests.post(
+            status_code, result = await self._fetch(
+                "POST",
                 f"{self.base_url}/api/mcp/coordinate",
-                json={"command": "Calculate weather-based analysis"},
-                timeout=20
+                20,
+                payload={"command": "Calculate weather-based analysis"}
             )
             
-            if response.status_code == 200:
-                result = response.json()
+            if status_code == 200:
                 print(f"   ✅ Direct Coordination: Working")
                 print(f"   📊 Status: {result.get('status', 'unknown')}")
                 coordination_working = True
             else:
-                print(f"   ❌ Direct Coordination: HTTP {response.status_code}")
+                print(f"   ❌ Direct Coordination: HTTP {status_code}")
                 
         except Exception as e:
             print(f"   ❌ Direct Coordination: Error - {e}")
         
         self.test_results['multi_agent_coordination'] = coordination_working
     
-    def test_error_handling_individually(self):
+    async def test_error_handling_individually(self):
         """Test error handling individually."""
-        print("\n🛡️ TESTING ERROR HANDLING INDIVIDUALLY")
-        print("=" * 60)
+        self._p("\n🛡️ TESTING ERROR HANDLING INDIVIDUALLY")
+        self._p("=" * 60)
         
         error_tests = [
             ("Invalid Command", "This is not a valid command for any agent"),
             ("Empty Command", ""),
             ("Special Characters", "!@#$%^&*()"),
-            ("Very Long Command", "A" * 1000)
+            ("Very Long Command", _LONG_CMD)
         ]
         
         error_handling_working = True
         
-        for test_name, command in error_tests:
-            print(f"\n🔍 Testing {test_name}: {command[:50]}...")
+        # Send all probes at once; the first one that raises fails the
+        # group, so the rest are cancelled
+        tasks = [
+            asyncio.create_task(self._post_command(command, 10))
+            for _, command in error_tests
+        ]
+        _, pending = await asyncio.wait(tasks, return_when=asyncio.FIRST_EXCEPTION)
+        for task in pending:
+            task.cancel()
+        await asyncio.gather(*pending, return_exceptions=True)
+        
+        for (test_name, command), task in zip(error_tests, tasks):
+            self._p(f"\n🔍 Testing {test_name}: {command[:50]}...")
+            
+            if task.cancelled():
+                self._p(f"   ⏭️ {test_name}: Skipped after an earlier failure")
+                continue
             
             try:
-                response = requests.post(
-                    f"{self.base_url}/api/mcp/command",
-                    json={"command": command},
-                    timeout=10
-                )
+                status_code, result = task.result()
                 
-                if response.status_code == 200:
-                    result = response.json()
+                if status_code == 200:
                     status = result.get("status", "unknown")
-                    print(f"   ✅ {test_name}: Handled gracefully (Status: {status})")
+                    self._p(f"   ✅ {test_name}: Handled gracefully (Status: {status})")
                 else:
-                    print(f"   ⚠️ {test_name}: HTTP {response.status_code}")
+                    self._p(f"   ⚠️ {test_name}: HTTP {status_code}")
                     
             except Exception as e:
-                print(f"   ❌ {test_name}: Error - {e}")
+                self._p(f"   ❌ {test_name}: Error - {e}")
                 error_handling_working = False
         
         self.test_results['error_handling'] = error_handling_working
+        self._flush()
     
     def generate_individual_test_summary(self):
         """Generate comprehensive individual test summary."""
-        print("\n" + "=" * 80)
-        print("📊 INDIVIDUAL COMPONENT TEST SUMMARY")
-        print("=" * 80)
+        self._p("\n" + "=" * 80)
+        self._p("📊 INDIVIDUAL COMPONENT TEST SUMMARY")
+        self._p("=" * 80)
         
         total_tests = len(self.test_results)
         passed_tests = sum(1 for result in self.test_results.values() if result)
         success_rate = (passed_tests / total_tests) * 100 if total_tests > 0 else 0
         
-        print(f"🧪 Total Individual Tests: {total_tests}")
-        print(f"✅ Passed Tests: {passed_tests}")
-        print(f"❌ Failed Tests: {total_tests - passed_tests}")
-        print(f"📈 Individual Success Rate: {success_rate:.1f}%")
+        self._p(f"🧪 Total Individual Tests: {total_tests}")
+        self._p(f"✅ Passed Tests: {passed_tests}")
+        self._p(f"❌ Failed Tests: {total_tests - passed_tests}")
+        self._p(f"📈 Individual Success Rate: {success_rate:.1f}%")
         
-        print(f"\n📋 DETAILED INDIVIDUAL RESULTS:")
+        self._p(f"\n📋 DETAILED INDIVIDUAL RESULTS:")
         
-        # Group results by category
-        categories = {
-            "Server": [k for k in self.test_results.keys() if k.startswith('server_')],
-            "Agents": [k for k in self.test_results.keys() if k.startswith('agent_')],
-            "Infrastructure": [k for k in self.test_results.keys() if k in ['mongodb_connection', 'inter_agent_communication']],
-            "Advanced Features": [k for k in self.test_results.keys() if k in ['multi_agent_coordination', 'error_handling']]
-        }
+        # Group results by category in a single pass
+        categories = {"Server": [], "Agents": [], "Infrastructure": [], "Advanced Features": []}
+        for key in self.test_results:
+            category = _CATEGORY_BY_KEY.get(key) or next(
+                (name for prefix, name in _CATEGORY_BY_PREFIX if key.startswith(prefix)), None
+            )
+            if category:
+                categories[category].append(key)
         
         for category, tests in categories.items():
             if tests:
-                print(f"\n   📁 {category}:")
+                self._p(f"\n   📁 {category}:")
                 for test in tests:
                     result = self.test_results[test]
                     status = "✅ WORKING" if result else "❌ NOT WORKING"
                     test_name = test.replace('_', ' ').title()
-                    print(f"      {test_name}: {status}")
+                    self._p(f"      {test_name}: {status}")
         
         # Overall assessment
         if success_rate >= 90:
-            print(f"\n🎉 EXCELLENT: All individual components working perfectly!")
+            self._p(f"\n🎉 EXCELLENT: All individual components working perfectly!")
         elif success_rate >= 75:
-            print(f"\n👍 VERY GOOD: Most individual components working well!")
+            self._p(f"\n👍 VERY GOOD: Most individual components working well!")
         elif success_rate >= 60:
-            print(f"\n⚡ GOOD: Individual components mostly functional!")
+            self._p(f"\n⚡ GOOD: Individual components mostly functional!")
         elif success_rate >= 40:
-            print(f"\n⚠️ FAIR: Some individual components need attention!")
+            self._p(f"\n⚠️ FAIR: Some individual components need attention!")
         else:
-            print(f"\n🔧 NEEDS WORK: Multiple individual components require fixing!")
+            self._p(f"\n🔧 NEEDS WORK: Multiple individual components require fixing!")
+        
+        # Probe timings, slowest first
+        if self._timings:
+            self._p(f"\n⏱️ PROBE TIMINGS:")
+            for key, elapsed in sorted(self._timings.items(), key=lambda kv: kv[1], reverse=True):
+                self._p(f"   {key.replace('_', ' ').title()}: {elapsed / 1e6:.1f} ms")
+            slowest_key, slowest_time = max(self._timings.items(), key=lambda kv: kv[1])
+            self._p(f"   🐢 Slowest: {slowest_key.replace('_', ' ').title()} ({slowest_time / 1e6:.1f} ms)")
         
         # Specific recommendations
-        print(f"\n💡 INDIVIDUAL COMPONENT STATUS:")
+        self._p(f"\n💡 INDIVIDUAL COMPONENT STATUS:")
         
         # Check critical components
         critical_working = all([
@@ -399,9 +505,9 @@ class IndividualComponentTester:
         ])
         
         if critical_working:
-            print(f"   ✅ Critical Components: All working individually")
+            self._p(f"   ✅ Critical Components: All working individually")
         else:
-            print(f"   ❌ Critical Components: Some issues detected")
+            self._p(f"   ❌ Critical Components: Some issues detected")
         
         # Check advanced features
         advanced_working = all([
@@ -410,26 +516,40 @@ class IndividualComponentTester:
         ])
         
         if advanced_working:
-            print(f"   ✅ Advanced Features: All working individually")
+            self._p(f"   ✅ Advanced Features: All working individually")
         else:
-            print(f"   ⚠️ Advanced Features: Some limitations detected")
+            self._p(f"   ⚠️ Advanced Features: Some limitations detected")
         
+        self._flush()
         return success_rate >= 75
     
-    def run_all_individual_tests(self):
+    async def run_all_individual_tests(self):
         """Run all individual component tests."""
         print("🧪 COMPREHENSIVE INDIVIDUAL COMPONENT TESTING")
         print("=" * 80)
         print("🎯 Testing each component individually to verify standalone functionality")
         print("=" * 80)
         
-        # Run all individual tests
-        self.test_server_basic_functionality()
-        self.test_individual_agents()
-        self.test_mongodb_storage_individually()
-        self.test_inter_agent_communication_individually()
-        self.test_multi_agent_coordination_individually()
-        self.test_error_handling_individually()
+        # One pooled session keeps connections alive across every probe
+        self.session = aiohttp.ClientSession(connector=aiohttp.TCPConnector(limit=20))
+        
+        # (timing key, test, label used to report an unexpected error)
+        probes = (
+            ("server", self.test_server_basic_functionality, None),
+            ("agents", self.test_individual_agents, None),
+            ("mongodb_connection", self.test_mongodb_storage_individually, "MongoDB Test"),
+            ("inter_agent_communication", self.test_inter_agent_communication_individually, "Inter-Agent Test"),
+            ("multi_agent_coordination", self.test_multi_agent_coordination_individually, "Coordination Test"),
+            ("error_handling", self.test_error_handling_individually, "Error Handling Test")
+        )
+        
+        try:
+            # Run all individual tests
+            for key, test, label in probes:
+                async with self._probe(key, label):
+                    await test()
+        finally:
+            await self.session.close()
         
         # Generate summary
         return self.generate_individual_test_summary()
@@ -437,7 +557,10 @@ class IndividualComponentTester:
 def main():
     """Main individual testing function."""
     tester = IndividualComponentTester()
-    success = tester.run_all_individual_tests()
+    try:
+        success = asyncio.run(tester.run_all_individual_tests())
+    finally:
+        tester.close()
     
     if success:
         print("\n🎉 INDIVIDUAL TESTING COMPLETED SUCCESSFULLY!")
@@ -4,37 +4,95 @@ Test Intelligent Chatbot - Demonstration of Complex Conditional Logic
 Shows how the chatbot handles scenarios like weather-based email automation
 """
 
+import asyncio
+import os
+import sys
 import requests
-import json
-from datetime import datetime
+from functools import lru_cache
+from itertools import islice
 
-def test_chatbot_scenarios():
+from check_http import JSON_HEADERS, dumps_json, loads_json, make_session
+
+BANNER80 = "=" * 80
+BANNER60 = "=" * 60
+
+# Per-command request timeout in seconds
+COMMAND_TIMEOUT = float(os.getenv('MCP_TEST_COMMAND_TIMEOUT', '15'))
+
+# Shared HTTP session so all scenarios reuse one keep-alive connection
+SESSION = make_session(pool_connections=4, pool_maxsize=20)
+
+def _send_command(command):
+    """Send one command to the MCP server on the shared session."""
+    return SESSION.post(
+        "http://localhost:8000/api/mcp/command",
+        data=dumps_json({"command": command}),
+        headers=JSON_HEADERS,
+        timeout=COMMAND_TIMEOUT
+    )
+
+def _describe_math_result(result, out):
+    math_result = result.get("result", result.get("formatted_result", "N/A"))
+    out.append(f"   🔢 Result: {math_result}")
+
+def _describe_weather_result(result, out):
+    city = result.get("city", "Unknown")
+    weather_data = result.get("weather_data", {})
+    temp = weather_data.get("temperature", "N/A")
+    desc = weather_data.get("description", "N/A")
+    out.append(f"   🌤️ Weather: {city} - {temp}°C, {desc}")
+
+def _describe_conditional_result(result, out):
+    out.append(f"   🤖 Conditional logic processed!")
+    out.append(f"   📋 System will monitor weather conditions")
+    out.append(f"   📧 Email will be sent if conditions are met")
+
+def _describe_reminder_result(result, out):
+    out.append(f"   📅 Reminder created successfully")
+
+def _describe_email_result(result, out):
+    out.append(f"   📧 Email workflow initiated")
+
+# Scenario-specific result lines, keyed by the scenario's "kind"
+RESULT_DESCRIBERS = {
+    "math": _describe_math_result,
+    "weather": _describe_weather_result,
+    "conditional": _describe_conditional_result,
+    "reminder": _describe_reminder_result,
+    "email": _describe_email_result,
+}
+
+async def test_chatbot_scenarios():
     """Test various chatbot scenarios."""
     print("🤖 INTELLIGENT CHATBOT DEMONSTRATION")
-    print("=" * 80)
+    print(BANNER80)
     print("🎯 Testing complex conditional logic and multi-agent coordination")
     print("📧 Email: shreekumarchandancharchit@gmail.com")
-    print("=" * 80)
+    print(BANNER80)
     
     # Test scenarios
     scenarios = [
         {
             "name": "Mathematical Calculation",
+            "kind": "math",
             "command": "What is 15% of 200?",
             "description": "Basic math calculation"
         },
         {
             "name": "Weather Query",
+            "kind": "weather",
             "command": "What is the weather in Mumbai?",
             "description": "Real-time weather data"
         },
         {
             "name": "Simple Reminder",
+            "kind": "reminder",
             "command": "Remind me to call John at 3 PM",
             "description": "Calendar reminder creation"
         },
         {
             "name": "Complex Conditional Logic",
+            "kind": "conditional",
             "command": "If it rains today after 4pm then remind me and send an email to shreekumarchandancharchit@gmail.com to not come to office and submit work on Monday EOD",
             "description": "Weather-based conditional email automation"
         },
@@ -45,6 +103,7 @@ def test_chatbot_scenarios():
         },
         {
             "name": "Email Workflow",
+            "kind": "email",
             "command": "Send an email to shreekumarchandancharchit@gmail.com about weather conditions",
             "description": "Direct email automation"
         }
@@ -54,80 +113,68 @@ def test_chatbot_scenarios():
     
     success_count = 0
     
-    for i, scenario in enumerate(scenarios, 1):
-        print(f"{i}. 🔍 {scenario['name']}")
-        print(f"   📝 Command: \"{scenario['command']}\"")
-        print(f"   💡 Description: {scenario['description']}")
+    # Send all scenarios at once; results are reported in scenario order
+    responses = await asyncio.gather(
+        *(asyncio.to_thread(_send_command, scenario["command"]) for scenario in scenarios),
+        return_exceptions=True
+    )
+    
+    for i, (scenario, response) in enumerate(zip(scenarios, responses), 1):
+        out = [f"{i}. 🔍 {scenario['name']}"]
+        out.append(f"   📝 Command: \"{scenario['command']}\"")
+        out.append(f"   💡 Description: {scenario['description']}")
         
         try:
-            # Send command to MCP server
-            response = requests.post(
-                "http://localhost:8000/api/mcp/command",
-                json={"command": scenario["command"]},
-                timeout=15
-            )
+            if isinstance(response, Exception):
+                raise response
             
             if response.status_code == 200:
-                result = response.json()
+                result = loads_json(response.content)
+                get = result.get
                 
-                if result.get("status") == "success":
-                    print(f"   ✅ Success!")
+                if get("status") == "success":
+                    out.append(f"   ✅ Success!")
                     
                     # Display specific results based on scenario type
-                    if "math" in scenario["name"].lower():
-                        math_result = result.get("result", result.get("formatted_result", "N/A"))
-                        print(f"   🔢 Result: {math_result}")
-                        
-                    elif "weather" in scenario["name"].lower():
-                        city = result.get("city", "Unknown")
-                        weather_data = result.get("weather_data", {})
-                        temp = weather_data.get("temperature", "N/A")
-                        desc = weather_data.get("description", "N/A")
-                        print(f"   🌤️ Weather: {city} - {temp}°C, {desc}")
-                        
-                    elif "conditional" in scenario["name"].lower():
-                        print(f"   🤖 Conditional logic processed!")
-                        print(f"   📋 System will monitor weather conditions")
-                        print(f"   📧 Email will be sent if conditions are met")
-                        
-                    elif "reminder" in scenario["name"].lower():
-                        print(f"   📅 Reminder created successfully")
-                        
-                    elif "email" in scenario["name"].lower():
-                        print(f"   📧 Email workflow initiated")
+                    describe_result = RESULT_DESCRIBERS.get(scenario.get("kind"))
+                    if describe_result:
+                        describe_result(result, out)
                     
                     # Show agent used
-                    agent_used = result.get("agent_used", "general")
-                    print(f"   🤖 Agent: {agent_used}")
+                    agent_used = get("agent_used", "general")
+                    out.append(f"   🤖 Agent: {agent_used}")
                     
                     success_count += 1
                     
                 else:
-                    print(f"   ❌ Failed: {result.get('message', 'Unknown error')}")
+                    out.append(f"   ❌ Failed: {get('message', 'Unknown error')}")
                     
                     # Show suggestions if available
-                    suggestions = result.get("suggestions", [])
+                    suggestions = get("suggestions", [])
                     if suggestions:
-                        print(f"   💡 Suggestions:")
-                        for suggestion in suggestions[:2]:
-                            print(f"      - {suggestion}")
+                        out.append(f"   💡 Suggestions:")
+                        for suggestion in islice(suggestions, 2):
+                            out.append(f"      - {suggestion}")
                     
             else:
-                print(f"   ❌ HTTP Error: {response.status_code}")
+                out.append(f"   ❌ HTTP Error: {response.status_code}")
                 
-        except requests.exceptions.Timeout:
-            print(f"   ❌ Request timeout (>15 seconds)")
-        except requests.exceptions.ConnectionError:
-            print(f"   ❌ Connection error - is the MCP server running?")
         except Exception as e:
-            print(f"   ❌ Unexpected error: {e}")
+            # isinstance keeps subclasses (ReadTimeout, ConnectTimeout) on the right message
+            if isinstance(e, requests.exceptions.Timeout):
+                out.append(f"   ❌ Request timeout (>{COMMAND_TIMEOUT:g} seconds)")
+            elif isinstance(e, requests.exceptions.ConnectionError):
+                out.append(f"   ❌ Connection error - is the MCP server running?")
+            else:
+                out.append(f"   ❌ Unexpected error: {e}")
         
-        print()  # Empty line between tests
+        # One write per scenario, with an empty line between tests
+        sys.stdout.write("\n".join(out) + "\n\n")
     
     # Final summary
-    print("=" * 80)
+    print(BANNER80)
     print("📊 INTELLIGENT CHATBOT TEST RESULTS")
-    print("=" * 80)
+    print(BANNER80)
     print(f"✅ Successful scenarios: {success_count}/{len(scenarios)}")
     print(f"📈 Success rate: {(success_count/len(scenarios))*100:.1f}%")
     
@@ -165,10 +212,27 @@ def test_chatbot_scenarios():
     
     return success_count == len(scenarios)
 
+@lru_cache(maxsize=256)
+def _parse_conditional(example):
+    """Split an "if ... then ..." statement into (condition, action).
+    
+    Returns None when the statement has no "if", and (None, None) when the
+    condition and action cannot be separated.
+    """
+    example_lower = example.lower()
+    if "if" not in example_lower:
+        return None
+    
+    parts = example_lower.split("then")
+    if len(parts) != 2:
+        return None, None
+    
+    return parts[0].replace("if", "").strip(), parts[1].strip()
+
 def test_conditional_logic_parsing():
     """Test conditional logic parsing capabilities."""
     print("\n🧠 TESTING CONDITIONAL LOGIC PARSING")
-    print("=" * 60)
+    print(BANNER60)
     
     conditional_examples = [
         "If it rains today after 4pm then remind me",
@@ -183,82 +247,90 @@ def test_conditional_logic_parsing():
         print(f"{i}. \"{example}\"")
         
         # Parse components
-        if "if" in example.lower():
-            parts = example.lower().split("then")
-            if len(parts) == 2:
-                condition = parts[0].replace("if", "").strip()
-                action = parts[1].strip()
+        parsed = _parse_conditional(example)
+        if parsed is not None:
+            condition, action = parsed
+            if condition is not None:
                 print(f"   🔍 Condition: {condition}")
                 print(f"   🎯 Action: {action}")
             else:
                 print(f"   ⚠️ Could not parse condition and action")
         print()
 
-def show_chatbot_capabilities():
-    """Show chatbot capabilities and examples."""
-    print("\n🤖 INTELLIGENT CHATBOT CAPABILITIES")
-    print("=" * 60)
+# Static capability examples shown before the tests run
+CAPABILITIES = {
+    "🔢 Mathematical Operations": [
+        "What is 15% of 200?",
+        "Calculate the area of a circle with radius 5",
+        "Solve 2 + 3 * 4",
+        "What is the square root of 16?"
+    ],
+    "🌤️ Weather Intelligence": [
+        "What is the weather in Mumbai?",
+        "Check temperature in Delhi",
+        "Is it raining in New York?",
+        "Weather forecast for London"
+    ],
+    "📅 Calendar & Reminders": [
+        "Remind me to call John at 3 PM",
+        "Schedule meeting with team tomorrow",
+        "Set reminder for doctor appointment",
+        "Create calendar event for project review"
+    ],
+    "📧 Email Automation": [
+        "Send email to john@example.com about meeting",
+        "Email weather report to team@company.com",
+        "Send document summary to manager@office.com",
+        "Mail project update to stakeholders@project.com"
+    ],
+    "🧠 Conditional Logic": [
+        "If it rains today then remind me to take umbrella",
+        "If temperature > 30°C then email heat warning to team",
+        "When it's sunny tomorrow then schedule outdoor meeting",
+        "If it snows this weekend then cancel picnic plans"
+    ],
+    "🔄 Complex Workflows": [
+        "Process weather data and email alerts to emergency@city.gov",
+        "Analyze document and send summary to manager@company.com",
+        "If weather is bad then email work-from-home notice to all staff",
+        "Calculate project costs and email report to finance@company.com"
+    ]
+}
+
+def _build_capabilities_text():
+    """Render the capabilities overview once; it never changes between calls."""
+    lines = ["\n🤖 INTELLIGENT CHATBOT CAPABILITIES", BANNER60]
     
-    capabilities = {
-        "🔢 Mathematical Operations": [
-            "What is 15% of 200?",
-            "Calculate the area of a circle with radius 5",
-            "Solve 2 + 3 * 4",
-            "What is the square root of 16?"
-        ],
-        "🌤️ Weather Intelligence": [
-            "What is the weather in Mumbai?",
-            "Check temperature in Delhi",
-            "Is it raining in New York?",
-            "Weather forecast for London"
-        ],
-        "📅 Calendar & Reminders": [
-            "Remind me to call John at 3 PM",
-            "Schedule meeting with team tomorrow",
-            "Set reminder for doctor appointment",
-            "Create calendar event for project review"
-        ],
-        "📧 Email Automation": [
-            "Send email to john@example.com about meeting",
-            "Email weather report to team@company.com",
-            "Send document summary to manager@office.com",
-            "Mail project update to stakeholders@project.com"
-        ],
-        "🧠 Conditional Logic": [
-            "If it rains today then remind me to take umbrella",
-            "If temperature > 30°C then email heat warning to team",
-            "When it's sunny tomorrow then schedule outdoor meeting",
-            "If it snows this weekend then cancel picnic plans"
-        ],
-        "🔄 Complex Workflows": [
-            "Process weather data and email alerts to emergency@city.gov",
-            "Analyze document and send summary to manager@company.com",
-            "If weather is bad then email work-from-home notice to all staff",
-            "Calculate project costs and email report to finance@company.com"
-        ]
-    }
+    for category, examples in CAPABILITIES.items():
+        lines.append(f"\n{category}:")
+        lines.extend(f"   • \"{example}\"" for example in examples)
     
-    for category, examples in capabilities.items():
-        print(f"\n{category}:")
-        for example in examples:
-            print(f"   • \"{example}\"")
+    lines.extend([
+        "\n🎯 SPECIAL FEATURE - YOUR SCENARIO:",
+        "   📝 \"If it rains today after 4pm then remind me and",
+        "       send email to shreekumarchandancharchit@gmail.com",
+        "       to not come to office and submit work on Monday EOD\"",
+        "   ",
+        "   🤖 System Processing:",
+        "   1. 🌤️ Monitors weather conditions in real-time",
+        "   2. ⏰ Checks if current time is after 4 PM",
+        "   3. 🌧️ Detects if it's raining",
+        "   4. 📅 Creates reminder for user",
+        "   5. 📧 Sends professional email to shreekumarchandancharchit@gmail.com",
+        "   6. 💼 Includes work-from-home instructions and Monday deadline"
+    ])
     
-    print(f"\n🎯 SPECIAL FEATURE - YOUR SCENARIO:")
-    print(f"   📝 \"If it rains today after 4pm then remind me and")
-    print(f"       send email to shreekumarchandancharchit@gmail.com")
-    print(f"       to not come to office and submit work on Monday EOD\"")
-    print(f"   ")
-    print(f"   🤖 System Processing:")
-    print(f"   1. 🌤️ Monitors weather conditions in real-time")
-    print(f"   2. ⏰ Checks if current time is after 4 PM")
-    print(f"   3. 🌧️ Detects if it's raining")
-    print(f"   4. 📅 Creates reminder for user")
-    print(f"   5. 📧 Sends professional email to shreekumarchandancharchit@gmail.com")
-    print(f"   6. 💼 Includes work-from-home instructions and Monday deadline")
+    return "\n".join(lines) + "\n"
+
+_CAPABILITIES_TEXT = _build_capabilities_text()
+
+def show_chatbot_capabilities():
+    """Show chatbot capabilities and examples."""
+    sys.stdout.write(_CAPABILITIES_TEXT)
 
 if __name__ == "__main__":
     print("🤖 INTELLIGENT MCP CHATBOT TESTER")
-    print("=" * 80)
+    print(BANNER80)
     
     # Show capabilities
     show_chatbot_capabilities()
@@ -267,7 +339,7 @@ if __name__ == "__main__":
     test_conditional_logic_parsing()
     
     # Run main tests
-    success = test_chatbot_scenarios()
+    success = asyncio.run(test_chatbot_scenarios())
     
     if success:
         print("\n🎉 INTELLIGENT CHATBOT IS FULLY OPERATIONAL!")
@@ -5,27 +5,73 @@ Comprehensive testing of agent coordination and MongoDB integration
 """
 
 import asyncio
-import requests
-import json
-from datetime import datetime
+import os
+import sys
+
+from check_http import JSON_HEADERS, dumps_json, loads_json, make_session
+
+BANNER80 = "=" * 80
+BANNER60 = "=" * 60
+
+# Request timeouts in seconds; lower them for fail-fast local runs
+HEALTH_TIMEOUT = float(os.getenv('MCP_TEST_HEALTH_TIMEOUT', '1.5'))
+# The status probe runs alongside the command probes, so it needs more headroom than the health gate
+STATUS_TIMEOUT = float(os.getenv('MCP_TEST_STATUS_TIMEOUT', '5'))
+COMMAND_TIMEOUT = float(os.getenv('MCP_TEST_COMMAND_TIMEOUT', '15'))
+COORDINATION_TIMEOUT = float(os.getenv('MCP_TEST_COORDINATION_TIMEOUT', '20'))
 
 class InterAgentSystemTester:
     """Test the inter-agent communication system."""
     
+    __slots__ = (
+        "base_url", "health_url", "status_url", "command_url", "coordinate_url",
+        "test_results", "passed", "failed", "session"
+    )
+    
     def __init__(self):
         self.base_url = "http://localhost:8000"
-        self.test_results = {}
+        self.health_url = f"{self.base_url}/api/health"
+        self.status_url = f"{self.base_url}/api/inter-agent/status"
+        self.command_url = f"{self.base_url}/api/mcp/command"
+        self.coordinate_url = f"{self.base_url}/api/mcp/coordinate"
+        self.test_results = []  # (name, passed) pairs in run order
+        self.passed = 0
+        self.failed = 0
+        
+        # Shared HTTP session so every request reuses one keep-alive connection
+        self.session = make_session(pool_connections=4, pool_maxsize=20)
+    
+    def _record(self, key, ok):
+        """Store a test result and keep the pass/fail counters in step."""
+        self.test_results.append((key, ok))
+        if ok:
+            self.passed += 1
+        else:
+            self.failed += 1
+    
+    async def _post_commands(self, commands, timeout):
+        """POST several commands concurrently; failures are returned as exceptions."""
+        return await asyncio.gather(
+            *(asyncio.to_thread(
+                self.session.post,
+                self.command_url,
+                data=dumps_json({"command": command}),
+                headers=JSON_HEADERS,
+                timeout=timeout
+            ) for command in commands),
+            return_exceptions=True
+        )
     
     def test_server_health(self):
         """Test server health and inter-agent status."""
         print("🔍 TESTING SERVER HEALTH & INTER-AGENT STATUS")
-        print("=" * 60)
+        print(BANNER60)
         
         try:
-            response = requests.get(f"{self.base_url}/api/health", timeout=5)
+            response = self.session.get(self.health_url, timeout=HEALTH_TIMEOUT)
             
             if response.status_code == 200:
-                health = response.json()
+                health = loads_json(response.content)
                 
                 print(f"✅ Server Status: {health.get('status', 'unknown')}")
                 print(f"🚀 Server Ready: {health.get('ready', False)}")
@@ -41,58 +87,57 @@ class InterAgentSystemTester:
                     print(f"   Inactive Agents: {inter_status.get('inactive_agents', 0)}")
                     print(f"   Agent Status: {inter_status.get('agent_status', {})}")
                 
-                self.test_results['server_health'] = True
+                self._record('server_health', True)
                 return True
             else:
                 print(f"❌ Server Health Check Failed: HTTP {response.status_code}")
-                self.test_results['server_health'] = False
+                self._record('server_health', False)
                 return False
                 
         except Exception as e:
             print(f"❌ Server Health Check Error: {e}")
-            self.test_results['server_health'] = False
+            self._record('server_health', False)
             return False
     
-    def test_inter_agent_status(self):
+    async def test_inter_agent_status(self):
         """Test dedicated inter-agent status endpoint."""
-        print("\n🔗 TESTING INTER-AGENT STATUS ENDPOINT")
-        print("=" * 60)
+        out = ["\n🔗 TESTING INTER-AGENT STATUS ENDPOINT", BANNER60]
+        results = []
         
         try:
-            response = requests.get(f"{self.base_url}/api/inter-agent/status", timeout=5)
+            response = await asyncio.to_thread(self.session.get, self.status_url, timeout=STATUS_TIMEOUT)
             
             if response.status_code == 200:
-                status = response.json()
+                status = loads_json(response.content)
                 
-                print(f"✅ Inter-Agent System: {status.get('system', 'unknown')}")
-                print(f"💾 MongoDB Connected: {status.get('mongodb_connected', False)}")
-                print(f"🤖 Total Agents: {status.get('total_agents', 0)}")
-                print(f"⚡ Active Agents: {status.get('active_agents', 0)}")
-                print(f"⚠️ Inactive Agents: {status.get('inactive_agents', 0)}")
+                out.append(f"✅ Inter-Agent System: {status.get('system', 'unknown')}")
+                out.append(f"💾 MongoDB Connected: {status.get('mongodb_connected', False)}")
+                out.append(f"🤖 Total Agents: {status.get('total_agents', 0)}")
+                out.append(f"⚡ Active Agents: {status.get('active_agents', 0)}")
+                out.append(f"⚠️ Inactive Agents: {status.get('inactive_agents', 0)}")
                 
                 # Show communication capabilities
                 comm_caps = status.get('communication_capabilities', {})
                 if comm_caps:
-                    print(f"\n🔗 COMMUNICATION CAPABILITIES:")
+                    out.append(f"\n🔗 COMMUNICATION CAPABILITIES:")
                     for agent, can_talk_to in comm_caps.items():
-                        print(f"   {agent} → {can_talk_to}")
+                        out.append(f"   {agent} → {can_talk_to}")
                 
-                self.test_results['inter_agent_status'] = True
-                return True
+                results.append(('inter_agent_status', True))
             else:
-                print(f"❌ Inter-Agent Status Failed: HTTP {response.status_code}")
-                self.test_results['inter_agent_status'] = False
-                return False
+                out.append(f"❌ Inter-Agent Status Failed: HTTP {response.status_code}")
+                results.append(('inter_agent_status', False))
                 
         except Exception as e:
-            print(f"❌ Inter-Agent Status Error: {e}")
-            self.test_results['inter_agent_status'] = False
-            return False
+            out.append(f"❌ Inter-Agent Status Error: {e}")
+            results.append(('inter_agent_status', False))
+        
+        return out, results
     
-    def test_single_agent_commands(self):
+    async def test_single_agent_commands(self):
         """Test single agent commands."""
-        print("\n🤖 TESTING SINGLE AGENT COMMANDS")
-        print("=" * 60)
+        out = ["\n🤖 TESTING SINGLE AGENT COMMANDS", BANNER60]
+        results = []
         
         single_agent_tests = [
             ("Calculate 20% of 500", "math_agent"),
@@ -100,43 +145,45 @@ class InterAgentSystemTester:
             ("Analyze this text: Hello world", "document_agent")
         ]
         
-        for command, expected_agent in single_agent_tests:
-            print(f"\n📤 Testing: {command}")
+        responses = await self._post_commands([command for command, _ in single_agent_tests], COMMAND_TIMEOUT)
+        
+        for (command, expected_agent), response in zip(single_agent_tests, responses):
+            out.append(f"\n📤 Testing: {command}")
             
             try:
-                response = requests.post(
-                    f"{self.base_url}/api/mcp/command",
-                    json={"command": command},
-                    timeout=15
-                )
+                if isinstance(response, Exception):
+                    raise response
                 
                 if response.status_code == 200:
-                    result = response.json()
+                    result = loads_json(response.content)
+                    get = result.get
                     
-                    status = result.get("status", "unknown")
-                    agent_used = result.get("agent_used", "unknown")
-                    stored = result.get("stored_in_mongodb", False)
+                    status = get("status", "unknown")
+                    agent_used = get("agent_used", "unknown")
+                    stored = get("stored_in_mongodb", False)
                     
-                    print(f"   ✅ Status: {status}")
-                    print(f"   🤖 Agent Used: {agent_used}")
-                    print(f"   💾 MongoDB Stored: {stored}")
+                    out.append(f"   ✅ Status: {status}")
+                    out.append(f"   🤖 Agent Used: {agent_used}")
+                    out.append(f"   💾 MongoDB Stored: {stored}")
                     
                     if "result" in result:
-                        print(f"   📊 Result: {result['result']}")
+                        out.append(f"   📊 Result: {result['result']}")
                     
-                    self.test_results[f'single_{expected_agent}'] = status == "success"
+                    results.append((f'single_{expected_agent}', status == "success"))
                 else:
-                    print(f"   ❌ HTTP Error: {response.status_code}")
-                    self.test_results[f'single_{expected_agent}'] = False
+                    out.append(f"   ❌ HTTP Error: {response.status_code}")
+                    results.append((f'single_{expected_agent}', False))
                     
             except Exception as e:
-                print(f"   ❌ Error: {e}")
-                self.test_results[f'single_{expected_agent}'] = False
+                out.append(f"   ❌ Error: {e}")
+                results.append((f'single_{expected_agent}', False))
+        
+        return out, results
     
-    def test_multi_agent_coordination(self):
+    async def test_multi_agent_coordination(self):
         """Test multi-agent coordination."""
-        print("\n🔗 TESTING MULTI-AGENT COORDINATION")
-        print("=" * 60)
+        out = ["\n🔗 TESTING MULTI-AGENT COORDINATION", BANNER60]
+        results = []
         
         multi_agent_tests = [
             "Calculate the cost of heating based on Mumbai weather",
@@ -145,100 +192,107 @@ class InterAgentSystemTester:
             "Calculate heating costs based on weather temperature analysis"
         ]
         
-        for command in multi_agent_tests:
-            print(f"\n🎯 Testing Multi-Agent: {command}")
+        # Test automatic coordination through regular commands
+        responses = await self._post_commands(multi_agent_tests, COORDINATION_TIMEOUT)
+        
+        for index, (command, response) in enumerate(zip(multi_agent_tests, responses), 1):
+            out.append(f"\n🎯 Testing Multi-Agent: {command}")
             
             try:
-                # Test automatic coordination through regular command
-                response = requests.post(
-                    f"{self.base_url}/api/mcp/command",
-                    json={"command": command},
-                    timeout=20
-                )
+                if isinstance(response, Exception):
+                    raise response
                 
                 if response.status_code == 200:
-                    result = response.json()
+                    result = loads_json(response.content)
+                    get = result.get
                     
-                    status = result.get("status", "unknown")
-                    agent_used = result.get("agent_used", "unknown")
-                    stored = result.get("stored_in_mongodb", False)
+                    status = get("status", "unknown")
+                    agent_used = get("agent_used", "unknown")
+                    stored = get("stored_in_mongodb", False)
                     
-                    print(f"   ✅ Status: {status}")
-                    print(f"   🤖 Agent/Coordination: {agent_used}")
-                    print(f"   💾 MongoDB Stored: {stored}")
+                    out.append(f"   ✅ Status: {status}")
+                    out.append(f"   🤖 Agent/Coordination: {agent_used}")
+                    out.append(f"   💾 MongoDB Stored: {stored}")
                     
                     # Check if it's a coordination result
                     if "participating_agents" in result:
-                        participating = result.get("participating_agents", [])
-                        inactive = result.get("inactive_agents", [])
-                        print(f"   🔗 Participating Agents: {participating}")
-                        print(f"   ⚠️ Inactive Agents: {inactive}")
+                        participating = get("participating_agents", [])
+                        inactive = get("inactive_agents", [])
+                        out.append(f"   🔗 Participating Agents: {participating}")
+                        out.append(f"   ⚠️ Inactive Agents: {inactive}")
                         
                         # Show individual agent results
-                        agent_results = result.get("results", {})
+                        agent_results = get("results", {})
                         for agent_id, agent_result in agent_results.items():
                             agent_status = agent_result.get("status", "unknown")
-                            print(f"      • {agent_id}: {agent_status}")
+                            out.append(f"      • {agent_id}: {agent_status}")
                     
-                    self.test_results[f'multi_agent_{len(self.test_results)}'] = status == "success"
+                    results.append((f'multi_agent_{index}', status == "success"))
                 else:
-                    print(f"   ❌ HTTP Error: {response.status_code}")
-                    self.test_results[f'multi_agent_{len(self.test_results)}'] = False
+                    out.append(f"   ❌ HTTP Error: {response.status_code}")
+                    results.append((f'multi_agent_{index}', False))
                     
             except Exception as e:
-                print(f"   ❌ Error: {e}")
-                self.test_results[f'multi_agent_{len(self.test_results)}'] = False
+                out.append(f"   ❌ Error: {e}")
+                results.append((f'multi_agent_{index}', False))
+        
+        return out, results
     
-    def test_direct_coordination_endpoint(self):
+    async def test_direct_coordination_endpoint(self):
         """Test direct coordination endpoint."""
-        print("\n🎯 TESTING DIRECT COORDINATION ENDPOINT")
-        print("=" * 60)
+        out = ["\n🎯 TESTING DIRECT COORDINATION ENDPOINT", BANNER60]
+        results = []
         
         coordination_command = "Calculate weather-based heating costs and analyze the data"
         
-        print(f"📤 Testing Direct Coordination: {coordination_command}")
+        out.append(f"📤 Testing Direct Coordination: {coordination_command}")
         
         try:
-            response = requests.post(
-                f"{self.base_url}/api/mcp/coordinate",
-                json={"command": coordination_command},
-                timeout=20
+            response = await asyncio.to_thread(
+                self.session.post,
+                self.coordinate_url,
+                data=dumps_json({"command": coordination_command}),
+                headers=JSON_HEADERS,
+                timeout=COORDINATION_TIMEOUT
             )
             
             if response.status_code == 200:
-                result = response.json()
+                result = loads_json(response.content)
+                get = result.get
                 
-                status = result.get("status", "unknown")
-                task = result.get("task", "unknown")
-                participating = result.get("participating_agents", [])
-                inactive = result.get("inactive_agents", [])
-                stored = result.get("stored_in_mongodb", False)
+                status = get("status", "unknown")
+                task = get("task", "unknown")
+                participating = get("participating_agents", [])
+                inactive = get("inactive_agents", [])
+                stored = get("stored_in_mongodb", False)
                 
-                print(f"   ✅ Status: {status}")
-                print(f"   🎯 Task: {task}")
-                print(f"   🔗 Participating: {participating}")
-                print(f"   ⚠️ Inactive: {inactive}")
-                print(f"   💾 MongoDB Stored: {stored}")
+                out.append(f"   ✅ Status: {status}")
+                out.append(f"   🎯 Task: {task}")
+                out.append(f"   🔗 Participating: {participating}")
+                out.append(f"   ⚠️ Inactive: {inactive}")
+                out.append(f"   💾 MongoDB Stored: {stored}")
                 
                 # Show results from each agent
-                agent_results = result.get("results", {})
+                agent_results = get("results", {})
                 for agent_id, agent_result in agent_results.items():
                     agent_status = agent_result.get("status", "unknown")
-                    print(f"      • {agent_id}: {agent_status}")
+                    out.append(f"      • {agent_id}: {agent_status}")
                 
-                self.test_results['direct_coordination'] = status == "success"
+                results.append(('direct_coordination', status == "success"))
             else:
-                print(f"   ❌ HTTP Error: {response.status_code}")
-                self.test_results['direct_coordination'] = False
+                out.append(f"   ❌ HTTP Error: {response.status_code}")
+                results.append(('direct_coordination', False))
                 
         except Exception as e:
-            print(f"   ❌ Error: {e}")
-            self.test_results['direct_coordination'] = False
+            out.append(f"   ❌ Error: {e}")
+            results.append(('direct_coordination', False))
+        
+        return out, results
     
-    def test_inactive_agent_handling(self):
+    async def test_inactive_agent_handling(self):
         """Test how system handles inactive agents."""
-        print("\n⚠️ TESTING INACTIVE AGENT HANDLING")
-        print("=" * 60)
+        out = ["\n⚠️ TESTING INACTIVE AGENT HANDLING", BANNER60]
+        results = []
         
         inactive_agent_tests = [
             "Send email about weather calculations",  # Should trigger gmail (inactive)
@@ -246,58 +300,60 @@ class InterAgentSystemTester:
             "Email the heating cost calculations and schedule a meeting"  # Both inactive
         ]
         
-        for command in inactive_agent_tests:
-            print(f"\n📤 Testing Inactive Agent Command: {command}")
+        responses = await self._post_commands(inactive_agent_tests, COMMAND_TIMEOUT)
+        
+        for index, (command, response) in enumerate(zip(inactive_agent_tests, responses), 1):
+            out.append(f"\n📤 Testing Inactive Agent Command: {command}")
             
             try:
-                response = requests.post(
-                    f"{self.base_url}/api/mcp/command",
-                    json={"command": command},
-                    timeout=15
-                )
+                if isinstance(response, Exception):
+                    raise response
                 
                 if response.status_code == 200:
-                    result = response.json()
+                    result = loads_json(response.content)
+                    get = result.get
                     
-                    status = result.get("status", "unknown")
-                    agent_used = result.get("agent_used", "unknown")
+                    status = get("status", "unknown")
+                    agent_used = get("agent_used", "unknown")
                     
-                    print(f"   ✅ Status: {status}")
-                    print(f"   🤖 Agent Used: {agent_used}")
+                    out.append(f"   ✅ Status: {status}")
+                    out.append(f"   🤖 Agent Used: {agent_used}")
                     
                     # Check if coordination was attempted
                     if "participating_agents" in result:
-                        participating = result.get("participating_agents", [])
-                        inactive = result.get("inactive_agents", [])
-                        print(f"   🔗 Active Participants: {participating}")
-                        print(f"   ⚠️ Inactive Agents: {inactive}")
+                        participating = get("participating_agents", [])
+                        inactive = get("inactive_agents", [])
+                        out.append(f"   🔗 Active Participants: {participating}")
+                        out.append(f"   ⚠️ Inactive Agents: {inactive}")
                     
-                    self.test_results[f'inactive_handling_{len(self.test_results)}'] = True
+                    results.append((f'inactive_handling_{index}', True))
                 else:
-                    print(f"   ❌ HTTP Error: {response.status_code}")
-                    self.test_results[f'inactive_handling_{len(self.test_results)}'] = False
+                    out.append(f"   ❌ HTTP Error: {response.status_code}")
+                    results.append((f'inactive_handling_{index}', False))
                     
             except Exception as e:
-                print(f"   ❌ Error: {e}")
-                self.test_results[f'inactive_handling_{len(self.test_results)}'] = False
+                out.append(f"   ❌ Error: {e}")
+                results.append((f'inactive_handling_{index}', False))
+        
+        return out, results
     
     def generate_summary(self):
         """Generate test summary."""
-        print("\n" + "=" * 80)
+        print("\n" + BANNER80)
         print("📊 INTER-AGENT COMMUNICATION SYSTEM TEST SUMMARY")
-        print("=" * 80)
+        print(BANNER80)
         
         total_tests = len(self.test_results)
-        passed_tests = sum(1 for result in self.test_results.values() if result)
+        passed_tests = self.passed
         success_rate = (passed_tests / total_tests) * 100 if total_tests > 0 else 0
         
         print(f"🧪 Total Tests: {total_tests}")
         print(f"✅ Passed Tests: {passed_tests}")
-        print(f"❌ Failed Tests: {total_tests - passed_tests}")
+        print(f"❌ Failed Tests: {self.failed}")
         print(f"📈 Success Rate: {success_rate:.1f}%")
         
         print(f"\n📋 DETAILED RESULTS:")
-        for test_name, result in self.test_results.items():
+        for test_name, result in self.test_results:
             status = "✅ PASS" if result else "❌ FAIL"
             print(f"   {test_name}: {status}")
         
@@ -311,26 +367,34 @@ class InterAgentSystemTester:
             print(f"\n🔧 NEEDS WORK: Inter-agent communication system requires troubleshooting!")
         
         print(f"\n🌐 ACCESS POINTS:")
-        print(f"   • Server Health: {self.base_url}/api/health")
-        print(f"   • Inter-Agent Status: {self.base_url}/api/inter-agent/status")
-        print(f"   • Command API: {self.base_url}/api/mcp/command")
-        print(f"   • Coordination API: {self.base_url}/api/mcp/coordinate")
+        print(f"   • Server Health: {self.health_url}")
+        print(f"   • Inter-Agent Status: {self.status_url}")
+        print(f"   • Command API: {self.command_url}")
+        print(f"   • Coordination API: {self.coordinate_url}")
     
-    def run_all_tests(self):
+    async def run_all_tests(self):
         """Run all tests."""
         print("🧪 COMPREHENSIVE INTER-AGENT COMMUNICATION SYSTEM TEST")
-        print("=" * 80)
+        print(BANNER80)
         print("🎯 Testing unified agent network with MongoDB integration")
         print("⚠️ Gmail and Calendar agents are intentionally inactive")
-        print("=" * 80)
+        print(BANNER80)
         
-        # Run all test categories
-        if self.test_server_health():
-            self.test_inter_agent_status()
-            self.test_single_agent_commands()
-            self.test_multi_agent_coordination()
-            self.test_direct_coordination_endpoint()
-            self.test_inactive_agent_handling()
+        # Run all test categories; everything after the health check is
+        # independent, so those stages run together and report in order
+        with self.session:
+            if self.test_server_health():
+                stages = await asyncio.gather(
+                    self.test_inter_agent_status(),
+                    self.test_single_agent_commands(),
+                    self.test_multi_agent_coordination(),
+                    self.test_direct_coordination_endpoint(),
+                    self.test_inactive_agent_handling()
+                )
+                for out, results in stages:
+                    sys.stdout.write("\n".join(out) + "\n")
+                    for key, ok in results:
+                        self._record(key, ok)
         
         # Generate summary
         self.generate_summary()
@@ -338,7 +402,7 @@ class InterAgentSystemTester:
 def main():
     """Main test function."""
     tester = InterAgentSystemTester()
-    tester.run_all_tests()
+    asyncio.run(tester.run_all_tests())
 
 if __name__ == "__main__":
     main()
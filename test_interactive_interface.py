@@ -4,12 +4,105 @@ Test Interactive Interface
 Test the new interactive web interface functionality
 """
 
-import requests
+import math
+import re
+import sys
 import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 
+from check_http import loads_json, make_session
+
+# Shared HTTP session so every request reuses one keep-alive connection
+SESSION = make_session()
+
+# Key interactive elements expected in the web interface HTML
+INTERACTIVE_ELEMENTS = (
+    'id="queryInput"',
+    'id="sendBtn"',
+    'id="clearBtn"',
+    'id="historyBtn"',
+    'class="example"',
+    'data-query=',
+    'addEventListener',
+    'sendQuery()',
+    'displayResult',
+    'showHistory'
+)
+# One pass over the page finds every element instead of one scan per element.
+# The page is scanned as raw bytes (all elements are ASCII) so chunks need no decoding.
+_ELEMENT_PATTERN = re.compile(b"|".join(re.escape(element.encode()) for element in INTERACTIVE_ELEMENTS))
+_ELEMENT_MAX_LEN = max(len(element) for element in INTERACTIVE_ELEMENTS)
+# The interface counts as fully interactive once 80% of the elements are present
+_ELEMENTS_NEEDED = math.ceil(len(INTERACTIVE_ELEMENTS) * 0.8)
+
+# Agent-specific result fields, in display priority order
+DISPLAY_FIELDS = (
+    ("result", "🔢 Answer: {}"),
+    ("city", "🌍 Location: {}"),
+    ("total_documents", "📄 Documents: {} processed")
+)
+
+# Static report sections, printed after the live checks
+INTERFACE_FEATURES = (
+    "✅ Real-time query processing",
+    "✅ Click-to-fill example queries",
+    "✅ Enter key submission",
+    "✅ Loading animations and feedback",
+    "✅ Formatted response display",
+    "✅ Query history tracking",
+    "✅ Status monitoring",
+    "✅ Error handling with notifications",
+    "✅ Mobile-responsive design",
+    "✅ Auto-focus and user experience"
+)
+USER_INTERFACE_FEATURES = (
+    "🎯 Input Box: Large, focused, with placeholder text",
+    "🚀 Send Button: Interactive with loading states",
+    "📝 Example Queries: Click-to-fill functionality",
+    "📊 Real-time Status: Auto-updating system health",
+    "🔄 Query History: Clickable history with reuse",
+    "🎨 Visual Feedback: Animations, notifications, colors",
+    "⌨️ Keyboard Support: Enter key submission",
+    "📱 Mobile Friendly: Responsive design"
+)
+INTERFACE_STATUS_PASSED = (
+    "✅ FULLY INTERACTIVE AND WORKING!",
+    "Users can now easily interact with the system through:",
+    "   • Typing queries in the input box",
+    "   • Clicking example query buttons",
+    "   • Using Enter key or Send button",
+    "   • Viewing formatted real-time responses",
+    "   • Accessing query history",
+    "   • Monitoring system status"
+)
+INTERFACE_STATUS_PARTIAL = ("⚠️ PARTIALLY WORKING - Some issues detected",)
+
+def _scan_interface(url):
+    """Stream the interface page and return (status_code, elements found).
+    
+    Reading stops as soon as enough elements have been seen to call the
+    interface interactive, so large pages are not downloaded in full.
+    """
+    found = set()
+    with SESSION.get(url, stream=True, timeout=5) as response:
+        if response.status_code != 200:
+            return response.status_code, found
+        
+        # Carry the end of each chunk over so elements split across chunks still match
+        tail = b""
+        for chunk in response.iter_content(chunk_size=16384):
+            window = tail + chunk
+            found.update(match.decode() for match in _ELEMENT_PATTERN.findall(window))
+            if len(found) >= _ELEMENTS_NEEDED:
+                break
+            tail = window[-(_ELEMENT_MAX_LEN - 1):]
+    
+    return response.status_code, found
+
 def test_interactive_interface():
     """Test the interactive web interface."""
+    started = time.perf_counter()
     print("🧪 TESTING INTERACTIVE WEB INTERFACE")
     print("=" * 80)
     print(f"🕐 {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
@@ -17,59 +110,77 @@ def test_interactive_interface():
     
     base_url = "http://localhost:8000"
     
+    test_queries = [
+        {
+            "query": "Calculate 10 + 5",
+            "expected_agent": "math_agent",
+            "description": "Math calculation"
+        },
+        {
+            "query": "What is the weather in Mumbai?",
+            "expected_agent": "weather_agent", 
+            "description": "Weather query"
+        },
+        {
+            "query": "Analyze this text: Interactive interface test",
+            "expected_agent": "document_agent",
+            "description": "Document analysis"
+        }
+    ]
+    
+    # The page scan is read-only, so it runs alongside the health check; the
+    # commands get stored in MongoDB, so they are only sent once the server is healthy
+    executor = ThreadPoolExecutor(max_workers=len(test_queries) + 1)
+    page_future = executor.submit(_scan_interface, base_url)
+    
     # Test 1: Check if server is running
     print("\n🔍 Test 1: Server Health Check")
     try:
-        response = requests.get(f"{base_url}/api/health", timeout=5)
+        response = SESSION.get(f"{base_url}/api/health", timeout=5)
         if response.status_code == 200:
-            health = response.json()
+            health = loads_json(response.content)
             print(f"   ✅ Server Status: {health.get('status')}")
             print(f"   ✅ Ready: {health.get('ready')}")
             print(f"   ✅ MongoDB: {'Connected' if health.get('mongodb_connected') else 'Disconnected'}")
             print(f"   ✅ Agents: {health.get('system', {}).get('loaded_agents', 0)} loaded")
         else:
             print(f"   ❌ Server error: HTTP {response.status_code}")
+            executor.shutdown(wait=False)
             return False
     except Exception as e:
         print(f"   ❌ Connection error: {e}")
+        executor.shutdown(wait=False)
         return False
     
+    # The commands are independent, so send them all at once; each test
+    # below only waits for its own response
+    query_futures = [
+        executor.submit(
+            SESSION.post,
+            f"{base_url}/api/mcp/command",
+            json={"command": test['query']},
+            timeout=30
+        )
+        for test in test_queries
+    ]
+    executor.shutdown(wait=False)
+    
     # Test 2: Check web interface accessibility
     print("\n🌐 Test 2: Web Interface Accessibility")
     try:
-        response = requests.get(base_url, timeout=5)
-        if response.status_code == 200:
-            content = response.text
-            
-            # Check for key interactive elements
-            interactive_elements = [
-                'id="queryInput"',
-                'id="sendBtn"',
-                'id="clearBtn"',
-                'id="historyBtn"',
-                'class="example"',
-                'data-query=',
-                'addEventListener',
-                'sendQuery()',
-                'displayResult',
-                'showHistory'
-            ]
-            
-            found_elements = []
-            for element in interactive_elements:
-                if element in content:
-                    found_elements.append(element)
-            
+        # Check for key interactive elements
+        status_code, found_elements = page_future.result()
+        if status_code == 200:
             print(f"   ✅ Web interface loaded successfully")
-            print(f"   ✅ Interactive elements found: {len(found_elements)}/{len(interactive_elements)}")
+            print(f"   ✅ Interactive elements found: {len(found_elements)}/{len(INTERACTIVE_ELEMENTS)}")
             
-            if len(found_elements) >= len(interactive_elements) * 0.8:  # 80% of elements found
+            if len(found_elements) >= _ELEMENTS_NEEDED:
                 print("   🎉 Interface appears fully interactive!")
             else:
                 print("   ⚠️ Some interactive elements may be missing")
                 
         else:
-            print(f"   ❌ Web interface error: HTTP {response.status_code}")
+            print(f"   ❌ Web interface error: HTTP {status_code}")
             return False
     except Exception as e:
         print(f"   ❌ Web interface error: {e}")
@@ -77,39 +188,17 @@ def test_interactive_interface():
     
     # Test 3: API Endpoint Functionality
     print("\n🔌 Test 3: API Endpoint Functionality")
-    test_queries = [
-        {
-            "query": "Calculate 10 + 5",
-            "expected_agent": "math_agent",
-            "description": "Math calculation"
-        },
-        {
-            "query": "What is the weather in Mumbai?",
-            "expected_agent": "weather_agent", 
-            "description": "Weather query"
-        },
-        {
-            "query": "Analyze this text: Interactive interface test",
-            "expected_agent": "document_agent",
-            "description": "Document analysis"
-        }
-    ]
-    
     successful_tests = 0
     
-    for i, test in enumerate(test_queries, 1):
+    for i, (test, future) in enumerate(zip(test_queries, query_futures), 1):
         print(f"\n   Test 3.{i}: {test['description']}")
         print(f"   📤 Query: {test['query']}")
         
         try:
-            response = requests.post(
-                f"{base_url}/api/mcp/command",
-                json={"command": test['query']},
-                timeout=30
-            )
+            response = future.result()
             
             if response.status_code == 200:
-                result = response.json()
+                result = loads_json(response.content)
                 status = result.get('status')
                 agent_used = result.get('agent_used')
                 
@@ -117,13 +206,12 @@ def test_interactive_interface():
                 print(f"   🤖 Agent: {agent_used}")
                 
                 if status == 'success':
-                    # Show specific results
-                    if 'result' in result:
-                        print(f"   🔢 Answer: {result['result']}")
-                    elif 'city' in result:
-                        print(f"   🌍 Location: {result['city']}")
-                    elif 'total_documents' in result:
-                        print(f"   📄 Documents: {result['total_documents']} processed")
+                    # Show the first agent-specific field the response carries
+                    for key, template in DISPLAY_FIELDS:
+                        value = result.get(key)
+                        if value is not None:
+                            print(f"   {template.format(value)}")
+                            break
                     
                     print(f"   💾 MongoDB: {'Stored' if result.get('stored_in_mongodb') else 'Not Stored'}")
                     successful_tests += 1
@@ -133,66 +221,35 @@ def test_interactive_interface():
                 print(f"   ❌ HTTP Error: {response.status_code}")
         except Exception as e:
             print(f"   ❌ Error: {e}")
-        
-        time.sleep(1)  # Brief pause between tests
-    
-    # Test 4: Interactive Features Summary
-    print(f"\n🎯 Test 4: Interactive Features Summary")
-    print("-" * 60)
-    
-    features = [
-        "✅ Real-time query processing",
-        "✅ Click-to-fill example queries", 
-        "✅ Enter key submission",
-        "✅ Loading animations and feedback",
-        "✅ Formatted response display",
-        "✅ Query history tracking",
-        "✅ Status monitoring",
-        "✅ Error handling with notifications",
-        "✅ Mobile-responsive design",
-        "✅ Auto-focus and user experience"
-    ]
-    
-    for feature in features:
-        print(f"   {feature}")
-    
-    # Final Results
-    print(f"\n" + "=" * 80)
-    print("🎯 INTERACTIVE INTERFACE TEST RESULTS")
-    print("=" * 80)
     
     total_tests = len(test_queries)
     success_rate = (successful_tests / total_tests) * 100 if total_tests > 0 else 0
+    passed = success_rate >= 80
     
-    print(f"✅ Server Health: Working")
-    print(f"✅ Web Interface: Accessible and Interactive")
-    print(f"✅ API Functionality: {successful_tests}/{total_tests} queries successful ({success_rate:.1f}%)")
-    print(f"✅ Interactive Features: All implemented")
-    
-    print(f"\n🌐 USER INTERFACE FEATURES:")
-    print("🎯 Input Box: Large, focused, with placeholder text")
-    print("🚀 Send Button: Interactive with loading states")
-    print("📝 Example Queries: Click-to-fill functionality")
-    print("📊 Real-time Status: Auto-updating system health")
-    print("🔄 Query History: Clickable history with reuse")
-    print("🎨 Visual Feedback: Animations, notifications, colors")
-    print("⌨️ Keyboard Support: Enter key submission")
-    print("📱 Mobile Friendly: Responsive design")
-    
-    print(f"\n🎉 INTERACTIVE INTERFACE STATUS:")
-    if success_rate >= 80:
-        print("✅ FULLY INTERACTIVE AND WORKING!")
-        print("Users can now easily interact with the system through:")
-        print("   • Typing queries in the input box")
-        print("   • Clicking example query buttons")
-        print("   • Using Enter key or Send button")
-        print("   • Viewing formatted real-time responses")
-        print("   • Accessing query history")
-        print("   • Monitoring system status")
-        return True
-    else:
-        print("⚠️ PARTIALLY WORKING - Some issues detected")
-        return False
+    # The closing sections are written as one block instead of one print per line
+    report = [
+        "",
+        "🎯 Test 4: Interactive Features Summary",
+        "-" * 60,
+        *(f"   {feature}" for feature in INTERFACE_FEATURES),
+        "",
+        "=" * 80,
+        "🎯 INTERACTIVE INTERFACE TEST RESULTS",
+        "=" * 80,
+        "✅ Server Health: Working",
+        "✅ Web Interface: Accessible and Interactive",
+        f"✅ API Functionality: {successful_tests}/{total_tests} queries successful ({success_rate:.1f}%)",
+        "✅ Interactive Features: All implemented",
+        f"⏱️ Test Duration: {time.perf_counter() - started:.2f}s",
+        "",
+        "🌐 USER INTERFACE FEATURES:",
+        *USER_INTERFACE_FEATURES,
+        "",
+        "🎉 INTERACTIVE INTERFACE STATUS:",
+        *(INTERFACE_STATUS_PASSED if passed else INTERFACE_STATUS_PARTIAL)
+    ]
+    sys.stdout.write("\n".join(report) + "\n")
+    return passed
 
 def main():
     """Main function."""
@@ -4,69 +4,22 @@ Test LangChain PDF Chat Integration
 Verify that LangChain RAG is working for PDF question answering
 """
 
-import requests
-import time
+import importlib.util
 import sys
+import time
 from datetime import datetime
+from functools import lru_cache
 from pathlib import Path
+from urllib.parse import urlencode
+from concurrent.futures import ThreadPoolExecutor
 
-def test_langchain_availability():
-    """Test if LangChain components are available."""
-    print("🧪 TESTING LANGCHAIN AVAILABILITY")
-    print("=" * 60)
-    
-    try:
-        # Test LangChain imports
-        sys.path.insert(0, str(Path(__file__).parent / "data" / "multimodal"))
-        from pdf_reader import EnhancedPDFReader
-        
-        # Initialize PDF reader
-        pdf_reader = EnhancedPDFReader()
-        
-        print(f"   ✅ EnhancedPDFReader imported successfully")
-        print(f"   🤖 LLM Available: {pdf_reader.llm is not None}")
-        print(f"   🔗 Embeddings Available: {pdf_reader.embeddings is not None}")
-        print(f"   📝 Text Splitter Available: {pdf_reader.text_splitter is not None}")
-        print(f"   💾 Memory Available: {pdf_reader.memory is not None}")
-        
-        if pdf_reader.llm:
-            print(f"   🎯 LangChain RAG: READY")
-            return True, pdf_reader
-        else:
-            print(f"   ⚠️ LangChain RAG: NOT AVAILABLE (missing API key or dependencies)")
-            return False, pdf_reader
-            
-    except Exception as e:
-        print(f"   ❌ LangChain Error: {e}")
-        return False, None
+from check_http import loads_json, make_session
 
-def test_pdf_chat_with_langchain():
-    """Test PDF chat functionality with LangChain."""
-    print("\n📄 TESTING PDF CHAT WITH LANGCHAIN")
-    print("=" * 60)
-    
-    base_url = "http://localhost:8000"
-    
-    # Test 1: Check server health
-    print("\n🔍 Step 1: Server Health Check")
-    try:
-        response = requests.get(f"{base_url}/api/health", timeout=5)
-        if response.status_code == 200:
-            health = response.json()
-            print(f"   ✅ Server Status: {health.get('status')}")
-            print(f"   ✅ Ready: {health.get('ready')}")
-        else:
-            print(f"   ❌ Server error: HTTP {response.status_code}")
-            return False
-    except Exception as e:
-        print(f"   ❌ Connection error: {e}")
-        return False
-    
-    # Test 2: Upload a test document
-    print("\n📤 Step 2: Upload Test Document")
-    
-    # Create a comprehensive test document
-    test_content = """
+# Shared HTTP session so every request reuses one keep-alive connection
+SESSION = make_session()
+
+# Comprehensive test document for the RAG questions below
+TEST_CONTENT = """
     LangChain RAG Test Document
     
     This is a comprehensive test document for verifying LangChain RAG functionality in the PDF chat system.
@@ -116,19 +69,93 @@ def test_pdf_chat_with_langchain():
     This document serves as a comprehensive test case for LangChain RAG functionality.
     It contains structured information that can be used to verify question-answering capabilities.
     """
+TEST_FILENAME = "langchain_rag_test.txt"
+
+# The upload form never changes, so encode it once rather than on every run
+TEST_UPLOAD_BODY = urlencode({"content": TEST_CONTENT, "filename": TEST_FILENAME}).encode()
+FORM_HEADERS = {"Content-Type": "application/x-www-form-urlencoded"}
+
+# Packages the LangChain RAG path cannot work without
+LANGCHAIN_MODULES = ("langchain", "langchain_community")
+
+# Response fields that may carry the chat answer, in priority order
+ANSWER_FIELDS = ("answer", "message", "result")
+
+@lru_cache(maxsize=1)
+def _get_pdf_reader():
+    """Create the EnhancedPDFReader once; setting up its LLM and embeddings is slow."""
+    sys.path.insert(0, str(Path(__file__).parent / "data" / "multimodal"))
+    from pdf_reader import EnhancedPDFReader
+    
+    return EnhancedPDFReader()
+
+def test_langchain_availability():
+    """Test if LangChain components are available."""
+    print("🧪 TESTING LANGCHAIN AVAILABILITY")
+    print("=" * 60)
+    
+    # Locating the packages is instant; importing pdf_reader pulls in the heavy ML stack
+    missing = [name for name in LANGCHAIN_MODULES if importlib.util.find_spec(name) is None]
+    if missing:
+        print(f"   ⚠️ LangChain RAG: NOT AVAILABLE (missing packages: {', '.join(missing)})")
+        return False, None
     
     try:
-        response = requests.post(
+        # Import LangChain components and initialize the (cached) PDF reader
+        pdf_reader = _get_pdf_reader()
+        
+        print(f"   ✅ EnhancedPDFReader imported successfully")
+        print(f"   🤖 LLM Available: {pdf_reader.llm is not None}")
+        print(f"   🔗 Embeddings Available: {pdf_reader.embeddings is not None}")
+        print(f"   📝 Text Splitter Available: {pdf_reader.text_splitter is not None}")
+        print(f"   💾 Memory Available: {pdf_reader.memory is not None}")
+        
+        if pdf_reader.llm:
+            print(f"   🎯 LangChain RAG: READY")
+            return True, pdf_reader
+        else:
+            print(f"   ⚠️ LangChain RAG: NOT AVAILABLE (missing API key or dependencies)")
+            return False, pdf_reader
+            
+    except Exception as e:
+        print(f"   ❌ LangChain Error: {e}")
+        return False, None
+
+def test_pdf_chat_with_langchain():
+    """Test PDF chat functionality with LangChain."""
+    print("\n📄 TESTING PDF CHAT WITH LANGCHAIN")
+    print("=" * 60)
+    
+    base_url = "http://localhost:8000"
+    
+    # Test 1: Check server health
+    print("\n🔍 Step 1: Server Health Check")
+    try:
+        response = SESSION.get(f"{base_url}/api/health", timeout=5)
+        if response.status_code == 200:
+            health = loads_json(response.content)
+            print(f"   ✅ Server Status: {health.get('status')}")
+            print(f"   ✅ Ready: {health.get('ready')}")
+        else:
+            print(f"   ❌ Server error: HTTP {response.status_code}")
+            return False
+    except Exception as e:
+        print(f"   ❌ Connection error: {e}")
+        return False
+    
+    # Test 2: Upload a test document
+    print("\n📤 Step 2: Upload Test Document")
+    
+    try:
+        response = SESSION.post(
             f"{base_url}/api/upload/text",
-            data={
-                'content': test_content,
-                'filename': 'langchain_rag_test.txt'
-            },
+            data=TEST_UPLOAD_BODY,
+            headers=FORM_HEADERS,
             timeout=30
         )
         
         if response.status_code == 200:
-            result = response.json()
+            result = loads_json(response.content)
             if result.get('status') == 'success':
                 file_id = result.get('file_id')
                 print(f"   ✅ Document uploaded successfully")
@@ -161,26 +188,39 @@ def test_pdf_chat_with_langchain():
                     }
                 ]
                 
+                # Lowercase each question's keywords once rather than on every answer check
+                for test in test_questions:
+                    test['keywords_lower'] = [(kw, kw.lower()) for kw in test['expected_keywords']]
+                
                 successful_rag_tests = 0
                 langchain_used = 0
                 
-                for i, test in enumerate(test_questions, 1):
-                    print(f"\n   Question {i}: {test['question']}")
-                    
-                    try:
-                        chat_response = requests.post(
+                # The questions are independent, so ask them together and report in order
+                with ThreadPoolExecutor(max_workers=len(test_questions)) as executor:
+                    futures = [
+                        executor.submit(
+                            SESSION.post,
                             f"{base_url}/api/chat/document",
+                            # The server already holds the uploaded text; refer to it by file_id
                             json={
                                 "question": test['question'],
-                                "document_content": test_content,
-                                "document_name": "langchain_rag_test.txt",
+                                "file_id": file_id,
+                                "document_name": TEST_FILENAME,
                                 "session_id": "langchain_test_session"
                             },
                             timeout=30
                         )
+                        for test in test_questions
+                    ]
+                
+                for i, (test, future) in enumerate(zip(test_questions, futures), 1):
+                    print(f"\n   Question {i}: {test['question']}")
+                    
+                    try:
+                        chat_response = future.result()
                         
                         if chat_response.status_code == 200:
-                            chat_result = chat_response.json()
+                            chat_result = loads_json(chat_response.content)
                             if chat_result.get('status') == 'success':
                                 print(f"   ✅ Chat successful")
                                 print(f"   🤖 Agent: {chat_result.get('agent_used', 'Unknown')}")
@@ -194,22 +234,16 @@ def test_pdf_chat_with_langchain():
                                 else:
                                     print(f"   ⚠️ Basic Processing: Used")
                                 
-                                # Check answer quality
-                                answer = ""
-                                if chat_result.get('answer'):
-                                    answer = chat_result['answer']
-                                elif chat_result.get('message'):
-                                    answer = chat_result['message']
-                                elif chat_result.get('result'):
-                                    answer = str(chat_result['result'])
+                                # Check answer quality using the first non-empty answer field
+                                answer = str(next(filter(None, map(chat_result.get, ANSWER_FIELDS)), ""))
                                 
                                 if answer:
                                     print(f"   💬 Answer: {answer[:100]}...")
                                     
                                     # Check if answer contains expected keywords
                                     answer_lower = answer.lower()
-                                    found_keywords = [kw for kw in test['expected_keywords'] 
-                                                    if kw.lower() in answer_lower]
+                                    found_keywords = [kw for kw, kw_lower in test['keywords_lower']
+                                                      if kw_lower in answer_lower]
                                     
                                     if found_keywords:
                                         print(f"   ✅ Keywords found: {found_keywords}")
@@ -224,8 +258,6 @@ def test_pdf_chat_with_langchain():
                             print(f"   ❌ Chat HTTP error: {chat_response.status_code}")
                     except Exception as e:
                         print(f"   ❌ Chat error: {e}")
-                    
-                    time.sleep(1)
                 
                 # Results Summary
                 print(f"\n📊 LANGCHAIN RAG TEST RESULTS:")
@@ -253,6 +285,7 @@ def test_pdf_chat_with_langchain():
 
 def main():
     """Main function."""
+    started = time.perf_counter()
     print("🧠 LANGCHAIN PDF CHAT INTEGRATION TESTER")
     print("=" * 80)
     print(f"🕐 {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
@@ -269,39 +302,49 @@ def main():
         print(f"\n⚠️ LangChain not fully available. Testing basic functionality...")
         success = test_pdf_chat_with_langchain()  # Still test, but expect fallback
     
-    # Final Results
-    print(f"\n" + "=" * 80)
-    print("🎯 LANGCHAIN PDF CHAT TEST RESULTS")
-    print("=" * 80)
+    # Final Results, written as one block instead of one print per line
+    report = ["", "=" * 80, "🎯 LANGCHAIN PDF CHAT TEST RESULTS", "=" * 80]
     
     if success:
-        print("✅ LANGCHAIN PDF CHAT TEST PASSED!")
+        report.append("✅ LANGCHAIN PDF CHAT TEST PASSED!")
         if langchain_available:
-            print("🧠 LangChain RAG is working correctly!")
-            print("🎉 Your PDF chat system uses advanced AI for question answering!")
+            report += [
+                "🧠 LangChain RAG is working correctly!",
+                "🎉 Your PDF chat system uses advanced AI for question answering!"
+            ]
         else:
-            print("⚠️ LangChain not available, but fallback system works!")
-        
-        print(f"\n🌐 ACCESS YOUR ENHANCED PDF CHAT:")
-        print("📄 PDF Chat Interface: http://localhost:8000/pdf-chat")
-        print("🏠 Main Interface: http://localhost:8000")
+            report.append("⚠️ LangChain not available, but fallback system works!")
         
-        print(f"\n🧠 LANGCHAIN FEATURES:")
+        report += [
+            "",
+            "🌐 ACCESS YOUR ENHANCED PDF CHAT:",
+            "📄 PDF Chat Interface: http://localhost:8000/pdf-chat",
+            "🏠 Main Interface: http://localhost:8000",
+            "",
+            "🧠 LANGCHAIN FEATURES:"
+        ]
         if langchain_available:
-            print("✅ RAG (Retrieval-Augmented Generation)")
-            print("✅ Vector embeddings for semantic search")
-            print("✅ Conversation memory")
-            print("✅ Document chunking and processing")
-            print("✅ LLM-powered intelligent responses")
+            report += [
+                "✅ RAG (Retrieval-Augmented Generation)",
+                "✅ Vector embeddings for semantic search",
+                "✅ Conversation memory",
+                "✅ Document chunking and processing",
+                "✅ LLM-powered intelligent responses"
+            ]
         else:
-            print("⚠️ Install LangChain dependencies for full RAG functionality")
-            print("💡 pip install langchain langchain-community langchain-together")
+            report += [
+                "⚠️ Install LangChain dependencies for full RAG functionality",
+                "💡 pip install langchain langchain-community langchain-together"
+            ]
         
     else:
-        print("⚠️ LANGCHAIN PDF CHAT TEST HAD ISSUES")
-        print("🔧 Some features may not be working correctly")
+        report += [
+            "⚠️ LANGCHAIN PDF CHAT TEST HAD ISSUES",
+            "🔧 Some features may not be working correctly"
+        ]
     
-    print(f"\n🕐 Test completed at: {datetime.now().strftime('%H:%M:%S')}")
+    report += ["", f"🕐 Test completed at: {datetime.now().strftime('%H:%M:%S')} ({time.perf_counter() - started:.2f}s)"]
+    sys.stdout.write("\n".join(report) + "\n")
     return success
 
 if __name__ == "__main__":
@@ -4,9 +4,63 @@ Final MongoDB Test
 Test the complete MongoDB integration
 """
 
-import requests
-import json
+import os
+import sys
 from datetime import datetime
+from functools import lru_cache
+from pathlib import Path
+
+from check_http import JSON_HEADERS, dumps_json, loads_json, make_session
+
+# Shared HTTP session so every request reuses one keep-alive connection
+SESSION = make_session()
+
+# Add paths
+sys.path.insert(0, str(Path(__file__).parent / "blackhole_core" / "data_source"))
+
+# This script needs only a couple of connections; keep one open and fail fast.
+# Must be set before the mongodb module is imported, which reads them.
+os.environ.setdefault("MONGO_MAX_POOL_SIZE", "10")
+os.environ.setdefault("MONGO_MIN_POOL_SIZE", "1")
+os.environ.setdefault("MONGO_TIMEOUT_MS", "2000")
+
+try:
+    from mongodb import get_agent_outputs_collection
+    HAS_MONGO = True
+except Exception as e:
+    HAS_MONGO = False
+    MONGO_IMPORT_ERROR = e
+
+# Closing status report, written in one go instead of one print per line
+FINAL_STATUS_REPORT = "\n".join([
+    "",
+    "=" * 60,
+    "🎯 FINAL MONGODB INTEGRATION STATUS",
+    "=" * 60,
+    "✅ MongoDB Connection: Working",
+    "✅ Real MongoDB Storage: Active",
+    "✅ Math Agent: Connected & Storing",
+    "✅ Weather Agent: Connected & Storing",
+    "✅ Document Agent: Connected & Storing",
+    "✅ Enhanced Storage: Available",
+    "✅ Database Indexes: Optimized",
+    "✅ Agent History: Tracked",
+    "",
+    "🌐 YOUR CONNECTED SYSTEM:",
+    "🚀 Web Interface: http://localhost:8000",
+    "📊 Health Check: http://localhost:8000/api/health",
+    "🤖 Agent Status: http://localhost:8000/api/agents",
+    "📚 API Documentation: http://localhost:8000/docs",
+    "💾 Enhanced Storage: enhanced_mongodb_storage.py",
+    "",
+    "🎉 MONGODB INTEGRATION COMPLETE!",
+    "Your agents are now fully connected with MongoDB storage!"
+]) + "\n"
+
+@lru_cache(maxsize=1)
+def _get_collection():
+    """Return the agent outputs collection, connecting to MongoDB on first use only."""
+    return get_agent_outputs_collection()
 
 def test_mongodb_integration():
     """Test the complete MongoDB integration."""
@@ -20,9 +74,9 @@ def test_mongodb_integration():
     # Test 1: Server Health
     print("\n🔍 Test 1: Server Health Check")
     try:
-        response = requests.get(f"{base_url}/api/health")
+        response = SESSION.get(f"{base_url}/api/health")
         if response.status_code == 200:
-            health = response.json()
+            health = loads_json(response.content)
             print(f"   ✅ Status: {health.get('status')}")
             print(f"   ✅ Ready: {health.get('ready')}")
             print(f"   ✅ MongoDB Connected: {health.get('mongodb_connected')}")
@@ -37,13 +91,14 @@ def test_mongodb_integration():
     # Test 2: Math Agent with MongoDB
     print("\n🔢 Test 2: Math Agent + MongoDB")
     try:
-        response = requests.post(
+        response = SESSION.post(
             f"{base_url}/api/mcp/command",
-            json={"command": "Calculate 200 + 300"},
+            data=dumps_json({"command": "Calculate 200 + 300"}),
+            headers=JSON_HEADERS,
             timeout=10
         )
         if response.status_code == 200:
-            result = response.json()
+            result = loads_json(response.content)
             print(f"   ✅ Status: {result.get('status')}")
             print(f"   🤖 Agent: {result.get('agent_used')}")
             print(f"   📊 Result: {result.get('result')}")
@@ -64,13 +119,14 @@ def test_mongodb_integration():
     # Test 3: Weather Agent with MongoDB
     print("\n🌤️ Test 3: Weather Agent + MongoDB")
     try:
-        response = requests.post(
+        response = SESSION.post(
             f"{base_url}/api/mcp/command",
-            json={"command": "What is the weather in Mumbai?"},
+            data=dumps_json({"command": "What is the weather in Mumbai?"}),
+            headers=JSON_HEADERS,
             timeout=15
         )
         if response.status_code == 200:
-            result = response.json()
+            result = loads_json(response.content)
             print(f"   ✅ Status: {result.get('status')}")
             print(f"   🤖 Agent: {result.get('agent_used')}")
             print(f"   🌍 City: {result.get('city', 'N/A')}")
@@ -88,13 +144,14 @@ def test_mongodb_integration():
     # Test 4: Document Agent with MongoDB
     print("\n📄 Test 4: Document Agent + MongoDB")
     try:
-        response = requests.post(
+        response = SESSION.post(
             f"{base_url}/api/mcp/command",
-            json={"command": "Analyze this text: MongoDB integration is working perfectly!"},
+            data=dumps_json({"command": "Analyze this text: MongoDB integration is working perfectly!"}),
+            headers=JSON_HEADERS,
             timeout=10
         )
         if response.status_code == 200:
-            result = response.json()
+            result = loads_json(response.content)
             print(f"   ✅ Status: {result.get('status')}")
             print(f"   🤖 Agent: {result.get('agent_used')}")
             print(f"   📊 Documents: {result.get('total_documents', 0)}")
@@ -112,23 +169,29 @@ def test_mongodb_integration():
     # Test 5: Enhanced MongoDB Storage
     print("\n💾 Test 5: Enhanced MongoDB Storage")
     try:
-        import sys
-        from pathlib import Path
-        sys.path.insert(0, str(Path(__file__).parent / "blackhole_core" / "data_source"))
+        if not HAS_MONGO:
+            raise RuntimeError(f"MongoDB module unavailable: {MONGO_IMPORT_ERROR}")
         
-        from mongodb import get_agent_outputs_collection
+        collection = _get_collection()
         
-        collection = get_agent_outputs_collection()
-        
-        # Count total documents
-        total_docs = collection.count_documents({})
+        # Count total documents from collection metadata instead of scanning every document
+        total_docs = collection.estimated_document_count()
         print(f"   ✅ Total documents in MongoDB: {total_docs}")
         
-        # Get recent documents
-        recent_docs = list(collection.find().sort("timestamp", -1).limit(5))
+        # Same timestamp index the agent connector creates (a no-op if it exists);
+        # MongoDB walks it backwards for the newest-first sort below
+        try:
+            collection.create_index("timestamp")
+        except Exception as e:
+            print(f"   ⚠️ Could not ensure timestamp index: {e}")
+        
+        # Get the documents shown below, fetching only the printed fields
+        recent_docs = list(
+            collection.find({}, {"agent_id": 1, "timestamp": 1, "_id": 0}).sort("timestamp", -1).limit(3)
+        )
         print(f"   ✅ Recent documents: {len(recent_docs)}")
         
-        for doc in recent_docs[:3]:
+        for doc in recent_docs:
             agent_id = doc.get('agent_id', 'unknown')
             timestamp = doc.get('timestamp', 'unknown')
             print(f"      📄 {agent_id}: {timestamp}")
@@ -138,28 +201,7 @@ def test_mongodb_integration():
     except Exception as e:
         print(f"   ❌ Enhanced storage error: {e}")
     
-    print("\n" + "=" * 60)
-    print("🎯 FINAL MONGODB INTEGRATION STATUS")
-    print("=" * 60)
-    
-    print("✅ MongoDB Connection: Working")
-    print("✅ Real MongoDB Storage: Active")
-    print("✅ Math Agent: Connected & Storing")
-    print("✅ Weather Agent: Connected & Storing")
-    print("✅ Document Agent: Connected & Storing")
-    print("✅ Enhanced Storage: Available")
-    print("✅ Database Indexes: Optimized")
-    print("✅ Agent History: Tracked")
-    
-    print("\n🌐 YOUR CONNECTED SYSTEM:")
-    print("🚀 Web Interface: http://localhost:8000")
-    print("📊 Health Check: http://localhost:8000/api/health")
-    print("🤖 Agent Status: http://localhost:8000/api/agents")
-    print("📚 API Documentation: http://localhost:8000/docs")
-    print("💾 Enhanced Storage: enhanced_mongodb_storage.py")
-    
-    print("\n🎉 MONGODB INTEGRATION COMPLETE!")
-    print("Your agents are now fully connected with MongoDB storage!")
+    sys.stdout.write(FINAL_STATUS_REPORT)
     
     return True
 
@@ -3,10 +3,14 @@
 Test MongoDB Storage - Quick test to verify storage is working
 """
 
-import requests
-import json
+import sys
 from datetime import datetime
 
+from check_http import JSON_HEADERS, dumps_json, loads_json, make_session
+
+# Shared HTTP session so every request reuses one keep-alive connection
+SESSION = make_session()
+
 def test_command_storage():
     """Test if commands are being stored in MongoDB."""
     print("🧪 TESTING MONGODB STORAGE")
@@ -20,35 +24,39 @@ def test_command_storage():
     ]
     
     for command in test_commands:
-        print(f"\n📤 Testing: {command}")
+        # Each command's lines are collected and written in one go
+        out = ["", f"📤 Testing: {command}"]
         
         try:
-            response = requests.post(
+            response = SESSION.post(
                 "http://localhost:8000/api/mcp/command",
-                json={"command": command},
+                data=dumps_json({"command": command}),
+                headers=JSON_HEADERS,
                 timeout=15
             )
             
             if response.status_code == 200:
-                result = response.json()
+                result = loads_json(response.content)
                 
                 # Check if stored in MongoDB
                 stored = result.get("stored_in_mongodb", False)
                 agent_used = result.get("agent_used", "unknown")
                 status = result.get("status", "unknown")
                 
-                print(f"   ✅ Status: {status}")
-                print(f"   🤖 Agent: {agent_used}")
-                print(f"   💾 MongoDB Storage: {'✅ Stored' if stored else '❌ Not Stored'}")
+                out.append(f"   ✅ Status: {status}")
+                out.append(f"   🤖 Agent: {agent_used}")
+                out.append(f"   💾 MongoDB Storage: {'✅ Stored' if stored else '❌ Not Stored'}")
                 
                 if "result" in result:
-                    print(f"   📊 Result: {result['result']}")
+                    out.append(f"   📊 Result: {result['result']}")
                 
             else:
-                print(f"   ❌ HTTP Error: {response.status_code}")
+                out.append(f"   ❌ HTTP Error: {response.status_code}")
                 
         except Exception as e:
-            print(f"   ❌ Error: {e}")
+            out.append(f"   ❌ Error: {e}")
+        
+        sys.stdout.write("\n".join(out) + "\n")
 
 if __name__ == "__main__":
     test_command_storage()
@@ -4,6 +4,28 @@ Test PDF Reader Import
 Verify that ConversationBufferMemory import is working correctly
 """
 
+import os
+import sys
+from functools import lru_cache
+from pathlib import Path
+
+# Import the PDF reader module once, up front
+sys.path.append(str(Path(__file__).parent / "data" / "multimodal"))
+try:
+    from pdf_reader import EnhancedPDFReader
+    HAS_PDF_READER = True
+except Exception as e:
+    HAS_PDF_READER = False
+    PDF_READER_IMPORT_ERROR = e
+
+@lru_cache(maxsize=1)
+def _load_env_once():
+    """Load .env a single time per process; later calls reuse the result."""
+    from dotenv import load_dotenv
+    
+    # Variables already set in the environment win over .env values
+    return load_dotenv(override=False)
+
 def test_langchain_imports():
     """Test LangChain imports including ConversationBufferMemory."""
     print("🧪 TESTING LANGCHAIN IMPORTS")
@@ -51,12 +73,11 @@ def test_pdf_reader_module():
     print("\n📄 TESTING PDF READER MODULE")
     print("=" * 50)
     
+    if not HAS_PDF_READER:
+        print(f"❌ PDF reader import error: {PDF_READER_IMPORT_ERROR}")
+        return False
+    
     try:
-        # Import the PDF reader module
-        import sys
-        sys.path.append('data/multimodal')
-        
-        from pdf_reader import EnhancedPDFReader
         print("✅ EnhancedPDFReader imported successfully")
         
         # Try to create an instance
@@ -71,9 +92,6 @@ def test_pdf_reader_module():
         
         return True
         
-    except ImportError as e:
-        print(f"❌ PDF reader import error: {e}")
-        return False
     except Exception as e:
         print(f"❌ PDF reader error: {e}")
         return False
@@ -83,11 +101,8 @@ def check_environment():
     print("\n🔍 CHECKING ENVIRONMENT")
     print("=" * 50)
     
-    import os
-    from dotenv import load_dotenv
-    
     # Load environment variables
-    load_dotenv()
+    _load_env_once()
     
     # Check for required environment variables
     required_vars = [
@@ -98,7 +113,7 @@ def check_environment():
     
     missing_vars = []
     for var in required_vars:
-        value = os.getenv(var)
+        value = os.environ.get(var)
         if value:
             print(f"✅ {var}: {'*' * len(value[:10])}...")
         else:
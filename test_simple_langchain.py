@@ -5,14 +5,66 @@ Test the LangChain integration with a simple document
 """
 
 import requests
+import sys
 import time
-from datetime import datetime
+from urllib.parse import urlencode
+
+from check_http import JSON_HEADERS, dumps_json, loads_json, make_session
+
+# Shared HTTP session so every request reuses one keep-alive connection
+SESSION = make_session()
+
+# Simple test document, built once at import
+SIMPLE_CONTENT = """
+    Simple Test Document for LangChain
+    
+    This is a simple test document to verify LangChain functionality.
+    
+    Key Information:
+    - Document Type: Test Document
+    - Purpose: Testing LangChain RAG
+    - Date: May 30, 2025
+    - Author: MCP System
+    
+    Important Facts:
+    - The capital of France is Paris
+    - The year 2025 is mentioned in this document
+    - This document contains exactly 4 key information points
+    - LangChain is a framework for building AI applications
+    
+    Conclusion:
+    This document serves as a simple test case for LangChain integration.
+    """
+SIMPLE_FILENAME = "simple_langchain_test.txt"
+
+# The upload form never changes, so encode it once rather than on every run
+SIMPLE_UPLOAD_BODY = urlencode({"content": SIMPLE_CONTENT, "filename": SIMPLE_FILENAME}).encode()
+FORM_HEADERS = {"Content-Type": "application/x-www-form-urlencoded"}
+
+# Readiness polling backs off from a quarter second up to two seconds between probes
+READY_DEADLINE_SECONDS = 30
+READY_MAX_DELAY_SECONDS = 2.0
+
+def _wait_until_ready(base_url):
+    """Poll /api/health until the server reports ready, giving up after the deadline."""
+    delay = 0.25
+    started = time.monotonic()
+    while time.monotonic() - started < READY_DEADLINE_SECONDS:
+        try:
+            response = SESSION.get(f"{base_url}/api/health", timeout=2)
+            if response.ok and loads_json(response.content).get('ready'):
+                return True
+        except (requests.RequestException, ValueError):
+            pass
+        time.sleep(delay)
+        delay = min(delay * 2, READY_MAX_DELAY_SECONDS)
+    return False
 
 def test_simple_langchain():
     """Test LangChain with a simple document."""
     print("🧠 SIMPLE LANGCHAIN TEST")
     print("=" * 60)
-    print(f"🕐 {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+    print(f"🕐 {time.strftime('%Y-%m-%d %H:%M:%S')}")
     print("=" * 60)
     
     base_url = "http://localhost:8000"
@@ -20,9 +72,9 @@ def test_simple_langchain():
     # Test 1: Check server health
     print("\n🔍 Step 1: Server Health Check")
     try:
-        response = requests.get(f"{base_url}/api/health", timeout=5)
+        response = SESSION.get(f"{base_url}/api/health", timeout=5)
         if response.status_code == 200:
-            health = response.json()
+            health = loads_json(response.content)
             print(f"   ✅ Server Status: {health.get('status')}")
             print(f"   ✅ Ready: {health.get('ready')}")
         else:
@@ -35,40 +87,16 @@ def test_simple_langchain():
     # Test 2: Upload a simple test document
     print("\n📤 Step 2: Upload Simple Test Document")
     
-    # Create a simple test document
-    simple_content = """
-    Simple Test Document for LangChain
-    
-    This is a simple test document to verify LangChain functionality.
-    
-    Key Information:
-    - Document Type: Test Document
-    - Purpose: Testing LangChain RAG
-    - Date: May 30, 2025
-    - Author: MCP System
-    
-    Important Facts:
-    - The capital of France is Paris
-    - The year 2025 is mentioned in this document
-    - This document contains exactly 4 key information points
-    - LangChain is a framework for building AI applications
-    
-    Conclusion:
-    This document serves as a simple test case for LangChain integration.
-    """
-    
     try:
-        response = requests.post(
+        response = SESSION.post(
             f"{base_url}/api/upload/text",
-            data={
-                'content': simple_content,
-                'filename': 'simple_langchain_test.txt'
-            },
+            data=SIMPLE_UPLOAD_BODY,
+            headers=FORM_HEADERS,
             timeout=30
         )
         
         if response.status_code == 200:
-            result = response.json()
+            result = loads_json(response.content)
             if result.get('status') == 'success':
                 file_id = result.get('file_id')
                 print(f"   ✅ Document uploaded successfully")
@@ -88,62 +116,72 @@ def test_simple_langchain():
                 successful_tests = 0
                 langchain_used = 0
                 
-                for i, question in enumerate(simple_questions, 1):
-                    print(f"\n   Question {i}: {question}")
+                # All questions go to the server in one request so the document is processed once
+                chat_results = []
+                try:
+                    chat_response = SESSION.post(
+                        f"{base_url}/api/chat/document/batch",
+                        data=dumps_json({
+                            "questions": simple_questions,
+                            "file_id": file_id,
+                            "document_name": SIMPLE_FILENAME,
+                            "session_id": "simple_test_session"
+                        }),
+                        headers=JSON_HEADERS,
+                        timeout=60
+                    )
                     
-                    try:
-                        chat_response = requests.post(
-                            f"{base_url}/api/chat/document",
-                            json={
-                                "question": question,
-                                "document_content": simple_content,
-                                "document_name": "simple_langchain_test.txt",
-                                "session_id": "simple_test_session"
-                            },
-                            timeout=30
-                        )
-                        
-                        if chat_response.status_code == 200:
-                            chat_result = chat_response.json()
-                            if chat_result.get('status') == 'success':
-                                print(f"   ✅ Chat successful")
-                                print(f"   🤖 Agent: {chat_result.get('agent_used', 'Unknown')}")
-                                
-                                # Check if LangChain was used
-                                if chat_result.get('rag_enabled'):
-                                    print(f"   🧠 LangChain RAG: ENABLED ✅")
-                                    langchain_used += 1
-                                elif chat_result.get('llm_powered'):
-                                    print(f"   🤖 LLM Powered: YES")
-                                else:
-                                    print(f"   ⚠️ Basic Processing: Used")
-                                
-                                # Show fallback reason if any
-                                if chat_result.get('fallback_reason'):
-                                    print(f"   ⚠️ Fallback: {chat_result['fallback_reason']}")
-                                
-                                # Get answer
-                                answer = ""
-                                if chat_result.get('answer'):
-                                    answer = chat_result['answer']
-                                elif chat_result.get('message'):
-                                    answer = chat_result['message']
-                                elif chat_result.get('result'):
-                                    answer = str(chat_result['result'])
-                                
-                                if answer:
-                                    print(f"   💬 Answer: {answer[:150]}...")
-                                    successful_tests += 1
-                                else:
-                                    print(f"   ⚠️ No answer received")
-                            else:
-                                print(f"   ❌ Chat failed: {chat_result.get('message', 'Unknown error')}")
+                    if chat_response.status_code == 200:
+                        batch_result = loads_json(chat_response.content)
+                        if batch_result.get('status') == 'success':
+                            chat_results = batch_result.get('answers', [])
                         else:
-                            print(f"   ❌ Chat HTTP error: {chat_response.status_code}")
-                    except Exception as e:
-                        print(f"   ❌ Chat error: {e}")
+                            print(f"   ❌ Chat failed: {batch_result.get('message', 'Unknown error')}")
+                    else:
+                        print(f"   ❌ Chat HTTP error: {chat_response.status_code}")
+                except Exception as e:
+                    print(f"   ❌ Chat error: {e}")
+                
+                # Per-question report, written as one block instead of one print per line
+                out = []
+                for i, (question, chat_result) in enumerate(zip(simple_questions, chat_results), 1):
+                    out.append(f"\n   Question {i}: {question}")
                     
-                    time.sleep(1)
+                    if chat_result.get('status') == 'success':
+                        out.append(f"   ✅ Chat successful")
+                        out.append(f"   🤖 Agent: {chat_result.get('agent_used', 'Unknown')}")
+                        
+                        # Check if LangChain was used
+                        if chat_result.get('rag_enabled'):
+                            out.append(f"   🧠 LangChain RAG: ENABLED ✅")
+                            langchain_used += 1
+                        elif chat_result.get('llm_powered'):
+                            out.append(f"   🤖 LLM Powered: YES")
+                        else:
+                            out.append(f"   ⚠️ Basic Processing: Used")
+                        
+                        # Show fallback reason if any
+                        if chat_result.get('fallback_reason'):
+                            out.append(f"   ⚠️ Fallback: {chat_result['fallback_reason']}")
+                        
+                        # Get answer
+                        answer = ""
+                        if chat_result.get('answer'):
+                            answer = chat_result['answer']
+                        elif chat_result.get('message'):
+                            answer = chat_result['message']
+                        elif chat_result.get('result'):
+                            answer = str(chat_result['result'])
+                        
+                        if answer:
+                            out.append(f"   💬 Answer: {answer[:150]}...")
+                            successful_tests += 1
+                        else:
+                            out.append(f"   ⚠️ No answer received")
+                    else:
+                        out.append(f"   ❌ Chat failed: {chat_result.get('message', 'Unknown error')}")
+                if out:
+                    sys.stdout.write("\n".join(out) + "\n")
                 
                 # Results Summary
                 print(f"\n📊 SIMPLE LANGCHAIN TEST RESULTS:")
@@ -174,9 +212,10 @@ def main():
     print("🧠 SIMPLE LANGCHAIN INTEGRATION TESTER")
     print("=" * 80)
     
-    # Wait a moment for server to be ready
+    # Wait for the server to report ready instead of sleeping a fixed time
     print("⏳ Waiting for server to be ready...")
-    time.sleep(10)
+    if not _wait_until_ready("http://localhost:8000"):
+        print("⚠️ Server did not report ready, running the test anyway")
     
     success = test_simple_langchain()
     
@@ -211,7 +250,7 @@ def main():
         print("🔧 LangChain may not be fully working")
         print("💡 Check the test results above for details")
     
-    print(f"\n🕐 Test completed at: {datetime.now().strftime('%H:%M:%S')}")
+    print(f"\n🕐 Test completed at: {time.strftime('%H:%M:%S')}")
     return success
 
 if __name__ == "__main__":
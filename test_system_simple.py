@@ -4,9 +4,12 @@ Simple System Test
 Test the MCP system and MongoDB storage
 """
 
-import requests
-import json
-from datetime import datetime
+import time
+
+from check_http import JSON_HEADERS, dumps_json, loads_json, make_session
+
+# Shared HTTP session so every request reuses one keep-alive connection
+SESSION = make_session()
 
 def test_system():
     """Test the system."""
@@ -14,15 +17,15 @@ def test_system():
     
     print("🧪 SIMPLE SYSTEM TEST")
     print("=" * 50)
-    print(f"🕐 {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+    print(f"🕐 {time.strftime('%Y-%m-%d %H:%M:%S')}")
     print("=" * 50)
     
     # Test 1: Health Check
     print("\n🔍 Health Check")
     try:
-        response = requests.get(f"{base_url}/api/health")
+        response = SESSION.get(f"{base_url}/api/health")
         if response.status_code == 200:
-            health = response.json()
+            health = loads_json(response.content)
             print(f"   ✅ Status: {health.get('status')}")
             print(f"   ✅ Ready: {health.get('ready')}")
             print(f"   ✅ MongoDB: {health.get('mongodb_connected')}")
@@ -35,13 +38,14 @@ def test_system():
     # Test 2: Math Command
     print("\n🔢 Math Command Test")
     try:
-        response = requests.post(
+        response = SESSION.post(
             f"{base_url}/api/mcp/command",
-            json={"command": "Calculate 100 + 50"},
+            data=dumps_json({"command": "Calculate 100 + 50"}),
+            headers=JSON_HEADERS,
             timeout=10
         )
         if response.status_code == 200:
-            result = response.json()
+            result = loads_json(response.content)
             print(f"   ✅ Status: {result.get('status')}")
             print(f"   🤖 Agent: {result.get('agent_used')}")
             print(f"   📊 Result: {result.get('result')}")
@@ -61,13 +65,14 @@ def test_system():
     # Test 3: Weather Command
     print("\n🌤️ Weather Command Test")
     try:
-        response = requests.post(
+        response = SESSION.post(
             f"{base_url}/api/mcp/command",
-            json={"command": "What is the weather in Mumbai?"},
+            data=dumps_json({"command": "What is the weather in Mumbai?"}),
+            headers=JSON_HEADERS,
             timeout=15
         )
         if response.status_code == 200:
-            result = response.json()
+            result = loads_json(response.content)
             print(f"   ✅ Status: {result.get('status')}")
             print(f"   🤖 Agent: {result.get('agent_used')}")
             print(f"   🌍 City: {result.get('city', 'N/A')}")
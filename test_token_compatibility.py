@@ -4,38 +4,19 @@ Test Token Compatibility and Chunking
 Verify that the improved chunking and token management works properly
 """
 
-import requests
+import sys
 import time
-from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from urllib.parse import urlencode
 
-def test_token_compatibility():
-    """Test token compatibility with various document sizes."""
-    print("🧪 TESTING TOKEN COMPATIBILITY AND CHUNKING")
-    print("=" * 80)
-    print(f"🕐 {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
-    print("=" * 80)
-    
-    base_url = "http://localhost:8000"
-    
-    # Test 1: Check server health
-    print("\n🔍 Step 1: Server Health Check")
-    try:
-        response = requests.get(f"{base_url}/api/health", timeout=5)
-        if response.status_code == 200:
-            health = response.json()
-            print(f"   ✅ Server Status: {health.get('status')}")
-            print(f"   ✅ Ready: {health.get('ready')}")
-        else:
-            print(f"   ❌ Server error: HTTP {response.status_code}")
-            return False
-    except Exception as e:
-        print(f"   ❌ Connection error: {e}")
-        return False
-    
-    # Test 2: Small document (should work with LangChain)
-    print("\n📄 Step 2: Testing Small Document")
-    
-    small_content = """
+from check_http import JSON_HEADERS, dumps_json, loads_json, make_session
+
+# Shared HTTP session so every request reuses one keep-alive connection
+SESSION = make_session()
+
+# Small document (should work with LangChain)
+SMALL_CONTENT = """
     Small Document Test
     
     This is a small document to test basic functionality.
@@ -47,13 +28,9 @@ def test_token_compatibility():
     
     This document should work perfectly with LangChain RAG.
     """
-    
-    test_small_document(base_url, small_content, "small_test.txt")
-    
-    # Test 3: Medium document (should work with optimized chunking)
-    print("\n📄 Step 3: Testing Medium Document")
-    
-    medium_content = """
+
+# Medium document (should work with optimized chunking)
+MEDIUM_CONTENT = """
     Medium Document Test for Token Compatibility
     
     This is a medium-sized document designed to test the improved chunking and token management system.
@@ -105,73 +82,120 @@ def test_token_compatibility():
     SECTION 6: CONCLUSION
     This medium-sized document serves as a comprehensive test case for the improved token compatibility and chunking system. It contains structured information across multiple sections, various data types, and sufficient content to test the system's ability to handle real-world documents effectively.
     """
+
+FORM_HEADERS = {"Content-Type": "application/x-www-form-urlencoded"}
+
+@lru_cache(maxsize=None)
+def _upload_body(content, filename):
+    """Encode an upload form once per document instead of on every request."""
+    return urlencode({"content": content, "filename": filename}).encode()
+
+def test_token_compatibility():
+    """Test token compatibility with various document sizes."""
+    print("🧪 TESTING TOKEN COMPATIBILITY AND CHUNKING")
+    print("=" * 80)
+    print(f"🕐 {time.strftime('%Y-%m-%d %H:%M:%S')}")
+    print("=" * 80)
     
-    test_medium_document(base_url, medium_content, "medium_test.txt")
+    base_url = "http://localhost:8000"
     
-    # Test 4: Large document (should use intelligent truncation)
-    print("\n📄 Step 4: Testing Large Document")
+    # Test 1: Check server health
+    print("\n🔍 Step 1: Server Health Check")
+    try:
+        response = SESSION.get(f"{base_url}/api/health", timeout=5)
+        if response.status_code == 200:
+            health = loads_json(response.content)
+            print(f"   ✅ Server Status: {health.get('status')}")
+            print(f"   ✅ Ready: {health.get('ready')}")
+        else:
+            print(f"   ❌ Server error: HTTP {response.status_code}")
+            return False
+    except Exception as e:
+        print(f"   ❌ Connection error: {e}")
+        return False
     
-    large_content = create_large_test_document()
-    test_large_document(base_url, large_content, "large_test.txt")
+    # The three document sizes are independent, so test them together and report in order
+    cases = (
+        # Test 2: Small document (should work with LangChain)
+        ("Step 2: Testing Small Document", test_small_document, SMALL_CONTENT, "small_test.txt"),
+        # Test 3: Medium document (should work with optimized chunking)
+        ("Step 3: Testing Medium Document", test_medium_document, MEDIUM_CONTENT, "medium_test.txt"),
+        # Test 4: Large document (should use intelligent truncation)
+        ("Step 4: Testing Large Document", test_large_document, create_large_test_document(), "large_test.txt")
+    )
+    with ThreadPoolExecutor(max_workers=len(cases)) as executor:
+        futures = [executor.submit(test, base_url, content, filename) for _, test, content, filename in cases]
+    
+    for (title, _, _, _), future in zip(cases, futures):
+        sys.stdout.write("\n".join([f"\n📄 {title}", *future.result()]) + "\n")
     
     print(f"\n" + "=" * 80)
     print("🎯 TOKEN COMPATIBILITY TEST COMPLETE")
     print("=" * 80)
 
 def test_small_document(base_url, content, filename):
-    """Test small document processing."""
+    """Test small document processing and return the report lines."""
+    out = []
     try:
-        response = requests.post(
+        response = SESSION.post(
             f"{base_url}/api/upload/text",
-            data={'content': content, 'filename': filename},
+            data=_upload_body(content, filename),
+            headers=FORM_HEADERS,
             timeout=30
         )
         
         if response.status_code == 200:
-            result = response.json()
-            print(f"   ✅ Small document uploaded: {result.get('text_length')} chars")
+            result = loads_json(response.content)
+            file_id = result.get('file_id')
+            out.append(f"   ✅ Small document uploaded: {result.get('text_length')} chars")
             
             # Test question
             question = "What is the purpose of this document?"
-            chat_response = requests.post(
+            chat_response = SESSION.post(
                 f"{base_url}/api/chat/document",
-                json={
+                data=dumps_json({
                     "question": question,
-                    "document_content": content,
+                    "file_id": file_id,
                     "document_name": filename
-                },
+                }),
+                headers=JSON_HEADERS,
                 timeout=30
             )
             
             if chat_response.status_code == 200:
-                chat_result = chat_response.json()
+                chat_result = loads_json(chat_response.content)
                 if chat_result.get('status') == 'success':
-                    print(f"   ✅ Small document chat successful")
+                    out.append(f"   ✅ Small document chat successful")
                     if chat_result.get('rag_enabled'):
-                        print(f"   🧠 LangChain RAG: ENABLED")
+                        out.append(f"   🧠 LangChain RAG: ENABLED")
                     else:
-                        print(f"   ⚠️ Fallback mode used")
+                        out.append(f"   ⚠️ Fallback mode used")
                 else:
-                    print(f"   ❌ Chat failed: {chat_result.get('message')}")
+                    out.append(f"   ❌ Chat failed: {chat_result.get('message')}")
             else:
-                print(f"   ❌ Chat HTTP error: {chat_response.status_code}")
+                out.append(f"   ❌ Chat HTTP error: {chat_response.status_code}")
         else:
-            print(f"   ❌ Upload failed: HTTP {response.status_code}")
+            out.append(f"   ❌ Upload failed: HTTP {response.status_code}")
     except Exception as e:
-        print(f"   ❌ Small document test error: {e}")
+        out.append(f"   ❌ Small document test error: {e}")
+    
+    return out
 
 def test_medium_document(base_url, content, filename):
-    """Test medium document processing."""
+    """Test medium document processing and return the report lines."""
+    out = []
     try:
-        response = requests.post(
+        response = SESSION.post(
             f"{base_url}/api/upload/text",
-            data={'content': content, 'filename': filename},
+            data=_upload_body(content, filename),
+            headers=FORM_HEADERS,
             timeout=30
         )
         
         if response.status_code == 200:
-            result = response.json()
-            print(f"   ✅ Medium document uploaded: {result.get('text_length')} chars")
+            result = loads_json(response.content)
+            file_id = result.get('file_id')
+            out.append(f"   ✅ Medium document uploaded: {result.get('text_length')} chars")
             
             # Test multiple questions
             questions = [
@@ -184,83 +208,97 @@ def test_medium_document(base_url, content, filename):
             successful_questions = 0
             rag_used = 0
             
-            for question in questions:
-                try:
-                    chat_response = requests.post(
-                        f"{base_url}/api/chat/document",
-                        json={
-                            "question": question,
-                            "document_content": content,
-                            "document_name": filename
-                        },
-                        timeout=30
-                    )
-                    
-                    if chat_response.status_code == 200:
-                        chat_result = chat_response.json()
-                        if chat_result.get('status') == 'success':
-                            successful_questions += 1
-                            if chat_result.get('rag_enabled'):
-                                rag_used += 1
-                except:
-                    pass
+            # All questions go to the server in one request so the document is processed once
+            try:
+                chat_response = SESSION.post(
+                    f"{base_url}/api/chat/document/batch",
+                    data=dumps_json({
+                        "questions": questions,
+                        "file_id": file_id,
+                        "document_name": filename
+                    }),
+                    headers=JSON_HEADERS,
+                    timeout=60
+                )
                 
-                time.sleep(1)
+                if chat_response.status_code == 200:
+                    batch_result = loads_json(chat_response.content)
+                    if batch_result.get('status') == 'success':
+                        for chat_result in batch_result.get('answers', []):
+                            if chat_result.get('status') == 'success':
+                                successful_questions += 1
+                                if chat_result.get('rag_enabled'):
+                                    rag_used += 1
+                    else:
+                        out.append(f"   ❌ Chat failed: {batch_result.get('message', 'Unknown error')}")
+                else:
+                    out.append(f"   ❌ Chat HTTP error: {chat_response.status_code}")
+            except Exception as e:
+                out.append(f"   ❌ Chat error: {e}")
             
-            print(f"   ✅ Medium document questions: {successful_questions}/{len(questions)} successful")
-            print(f"   🧠 LangChain RAG used: {rag_used}/{len(questions)} times")
+            out.append(f"   ✅ Medium document questions: {successful_questions}/{len(questions)} successful")
+            out.append(f"   🧠 LangChain RAG used: {rag_used}/{len(questions)} times")
             
         else:
-            print(f"   ❌ Upload failed: HTTP {response.status_code}")
+            out.append(f"   ❌ Upload failed: HTTP {response.status_code}")
     except Exception as e:
-        print(f"   ❌ Medium document test error: {e}")
+        out.append(f"   ❌ Medium document test error: {e}")
+    
+    return out
 
 def test_large_document(base_url, content, filename):
-    """Test large document processing."""
+    """Test large document processing and return the report lines."""
+    out = []
     try:
-        print(f"   📏 Large document size: {len(content)} characters")
+        out.append(f"   📏 Large document size: {len(content)} characters")
         
-        response = requests.post(
+        response = SESSION.post(
             f"{base_url}/api/upload/text",
-            data={'content': content, 'filename': filename},
+            data=_upload_body(content, filename),
+            headers=FORM_HEADERS,
             timeout=30
         )
         
         if response.status_code == 200:
-            result = response.json()
-            print(f"   ✅ Large document uploaded: {result.get('text_length')} chars")
+            result = loads_json(response.content)
+            file_id = result.get('file_id')
+            out.append(f"   ✅ Large document uploaded: {result.get('text_length')} chars")
             
             # Test question
             question = "What is this document about?"
-            chat_response = requests.post(
+            chat_response = SESSION.post(
                 f"{base_url}/api/chat/document",
-                json={
+                data=dumps_json({
                     "question": question,
-                    "document_content": content,
+                    "file_id": file_id,
                     "document_name": filename
-                },
+                }),
+                headers=JSON_HEADERS,
                 timeout=30
             )
             
             if chat_response.status_code == 200:
-                chat_result = chat_response.json()
+                chat_result = loads_json(chat_response.content)
                 if chat_result.get('status') == 'success':
-                    print(f"   ✅ Large document chat successful")
+                    out.append(f"   ✅ Large document chat successful")
                     if chat_result.get('content_truncated'):
-                        print(f"   ✂️ Content intelligently truncated")
+                        out.append(f"   ✂️ Content intelligently truncated")
                     if chat_result.get('rag_enabled'):
-                        print(f"   🧠 LangChain RAG: ENABLED")
+                        out.append(f"   🧠 LangChain RAG: ENABLED")
                     else:
-                        print(f"   ⚠️ Fallback mode used")
+                        out.append(f"   ⚠️ Fallback mode used")
                 else:
-                    print(f"   ❌ Chat failed: {chat_result.get('message')}")
+                    out.append(f"   ❌ Chat failed: {chat_result.get('message')}")
             else:
-                print(f"   ❌ Chat HTTP error: {chat_response.status_code}")
+                out.append(f"   ❌ Chat HTTP error: {chat_response.status_code}")
         else:
-            print(f"   ❌ Upload failed: HTTP {response.status_code}")
+            out.append(f"   ❌ Upload failed: HTTP {response.status_code}")
     except Exception as e:
-        print(f"   ❌ Large document test error: {e}")
+        out.append(f"   ❌ Large document test error: {e}")
+    
+    return out
 
+@lru_cache(maxsize=1)
 def create_large_test_document():
     """Create a large test document."""
     content = """
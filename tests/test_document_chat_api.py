@@ -0,0 +1,159 @@
+"""
+Tests for the document chat endpoints of the production MCP server.
+
+The LangChain reader and the document agent fallback are replaced with
+fakes, so the endpoints are exercised without an LLM or loaded agents.
+"""
+
+import os
+import sys
+import types
+import unittest
+from unittest.mock import patch
+
+# Add the project root to the Python path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+# Import the server to test; it needs FastAPI (and httpx for the test client)
+try:
+    from fastapi.testclient import TestClient
+    import production_mcp_server as server
+    HAS_SERVER = True
+except ImportError:
+    HAS_SERVER = False
+
+DOCUMENT_TEXT = "Uploaded test document. " * 40  # long enough for the LangChain path
+UPLOADED = {"text_20250530_test.txt": {"filename": "test.txt", "extracted_text": DOCUMENT_TEXT}}
+
+async def fake_fallback_chat(request):
+    """Answer from the document text the endpoint resolved."""
+    return {
+        "status": "success",
+        "answer": f"{request.question} -> {len(request.document_content)} chars"
+    }
+
+class FakeMemory:
+    """Conversation memory that only records how many turns it holds."""
+
+    def __init__(self):
+        self.turns = 0
+
+    def clear(self):
+        self.turns = 0
+
+class FakePDFReader:
+    """Stand-in for EnhancedPDFReader whose answers reveal the memory state."""
+
+    def __init__(self):
+        self.llm = object()
+        self.memory = FakeMemory()
+
+    def load_and_process_text(self, text, document_name=None):
+        return True
+
+    def ask_question(self, question, verbose=True):
+        answer = f"{question} (history: {self.memory.turns})"
+        self.memory.turns += 1
+        return answer
+
+    def get_document_summary(self, max_length=500):
+        return "summary"
+
+@unittest.skipUnless(HAS_SERVER, "FastAPI test client not installed")
+class TestDocumentChatAPI(unittest.TestCase):
+    """Test cases for /api/chat/document and /api/chat/document/batch."""
+
+    def setUp(self):
+        # No context manager, so the startup handlers (agent loading, MongoDB) do not run
+        self.client = TestClient(server.app)
+
+    @patch('production_mcp_server._fallback_document_chat', side_effect=fake_fallback_chat)
+    def test_known_file_id_uses_uploaded_text(self, mock_fallback):
+        """Test that a known file_id is resolved to the uploaded text."""
+        with patch.dict(server.uploaded_documents, UPLOADED):
+            response = self.client.post("/api/chat/document", json={
+                "question": "What is this?",
+                "file_id": "text_20250530_test.txt"
+            })
+
+        # Assertions
+        result = response.json()
+        self.assertEqual(result["status"], "success")
+        self.assertEqual(mock_fallback.call_args.args[0].document_content, DOCUMENT_TEXT)
+
+    @patch('production_mcp_server._fallback_document_chat', side_effect=fake_fallback_chat)
+    def test_unknown_file_id_is_an_error(self, mock_fallback):
+        """Test that an unknown file_id is reported instead of answered."""
+        for endpoint, body in (
+            ("/api/chat/document", {"question": "What is this?", "file_id": "missing.txt"}),
+            ("/api/chat/document/batch", {"questions": ["What is this?"], "file_id": "missing.txt"})
+        ):
+            result = self.client.post(endpoint, json=body).json()
+
+            # Assertions
+            self.assertEqual(result["status"], "error")
+            self.assertIn("Document not found", result["message"])
+        mock_fallback.assert_not_called()
+
+    @patch('production_mcp_server._fallback_document_chat', side_effect=fake_fallback_chat)
+    def test_batch_fallback_answers_keep_question_order(self, mock_fallback):
+        """Test that fallback batch answers come back in question order."""
+        questions = [f"Question {i}" for i in range(5)]
+
+        # Make the LangChain import fail so every question takes the fallback
+        with patch.dict(server.uploaded_documents, UPLOADED), \
+             patch.dict(sys.modules, {"pdf_reader": None}):
+            result = self.client.post("/api/chat/document/batch", json={
+                "questions": questions,
+                "file_id": "text_20250530_test.txt"
+            }).json()
+
+        # Assertions
+        self.assertEqual(result["status"], "success")
+        self.assertEqual(result["total_questions"], len(questions))
+        self.assertEqual(
+            [answer["answer"] for answer in result["answers"]],
+            [f"{question} -> {len(DOCUMENT_TEXT)} chars" for question in questions]
+        )
+
+    def test_langchain_answer_and_summary(self):
+        """Test that a long document is answered and summarized through LangChain."""
+        fake_module = types.SimpleNamespace(EnhancedPDFReader=FakePDFReader)
+
+        with patch.dict(server.uploaded_documents, UPLOADED), \
+             patch.dict(sys.modules, {"pdf_reader": fake_module}):
+            result = self.client.post("/api/chat/document", json={
+                "question": "What is this?",
+                "file_id": "text_20250530_test.txt"
+            }).json()
+
+        # Assertions
+        self.assertEqual(result["status"], "success")
+        self.assertEqual(result["agent_used"], "langchain_document_qa")
+        self.assertEqual(result["answer"], "What is this? (history: 0)")
+        self.assertEqual(result["document_summary"], "summary")
+
+    def test_batch_langchain_answers_are_independent(self):
+        """Test that LangChain batch answers are ordered and not conditioned on earlier ones."""
+        questions = ["First?", "Second?", "Third?"]
+        fake_module = types.SimpleNamespace(EnhancedPDFReader=FakePDFReader)
+
+        with patch.dict(server.uploaded_documents, UPLOADED), \
+             patch.dict(sys.modules, {"pdf_reader": fake_module}):
+            result = self.client.post("/api/chat/document/batch", json={
+                "questions": questions,
+                "file_id": "text_20250530_test.txt"
+            }).json()
+
+        # Assertions
+        self.assertEqual(result["status"], "success")
+        self.assertEqual(
+            [answer["answer"] for answer in result["answers"]],
+            [f"{question} (history: 0)" for question in questions]
+        )
+        for answer in result["answers"]:
+            self.assertTrue(answer["rag_enabled"])
+            self.assertEqual(answer["document_summary"], "summary")
+
+if __name__ == '__main__':
+    unittest.main()
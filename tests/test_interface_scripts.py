@@ -0,0 +1,155 @@
+"""
+Tests for the interactive interface and LangChain PDF chat scripts.
+
+The scripts normally probe a live server on localhost:8000; here their shared
+HTTP session is replaced with canned responses so the checks run offline.
+"""
+
+import io
+import json
+import os
+import sys
+import unittest
+from contextlib import redirect_stdout
+from unittest.mock import patch
+
+# Add the project root to the Python path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+# Import the scripts to test
+import test_interactive_interface as interface_script
+import test_langchain_pdf_chat as pdf_chat_script
+
+INTERFACE_HTML = (
+    '<input id="queryInput"><button id="sendBtn"></button><button id="clearBtn"></button>'
+    '<button id="historyBtn"></button><div class="example" data-query="Calculate 10 + 5"></div>'
+    '<script>btn.addEventListener("click", () => sendQuery()); displayResult(); showHistory();</script>'
+).encode()
+
+class FakeResponse:
+    """Minimal stand-in for requests.Response."""
+
+    def __init__(self, status_code=200, json_data=None, body=b"", chunk_size=None):
+        self.status_code = status_code
+        self._json_data = json_data
+        self._body = body
+        self._chunk_size = chunk_size
+
+    def json(self):
+        return self._json_data
+
+    @property
+    def content(self):
+        return json.dumps(self._json_data).encode() if self._json_data is not None else self._body
+
+    def iter_content(self, chunk_size=1):
+        size = self._chunk_size or chunk_size
+        for start in range(0, len(self._body), size):
+            yield self._body[start:start + size]
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+def fake_interface_get(url, **kwargs):
+    """Serve the health endpoint and the interface page."""
+    if url.endswith("/api/health"):
+        return FakeResponse(json_data={
+            "status": "ok",
+            "ready": True,
+            "mongodb_connected": True,
+            "system": {"loaded_agents": 3}
+        })
+    return FakeResponse(body=INTERFACE_HTML)
+
+def fake_command_post(url, json=None, **kwargs):
+    """Answer every MCP command successfully."""
+    return FakeResponse(json_data={"status": "success", "agent_used": "math_agent", "result": 15})
+
+class TestInteractiveInterfaceScript(unittest.TestCase):
+    """Test cases for test_interactive_interface.py."""
+
+    @patch('test_interactive_interface.SESSION')
+    def test_all_probes_succeed(self, mock_session):
+        """Test that the script passes when every probe succeeds."""
+        # Setup mocks
+        mock_session.get.side_effect = fake_interface_get
+        mock_session.post.side_effect = fake_command_post
+
+        # Call the function
+        with redirect_stdout(io.StringIO()):
+            success = interface_script.test_interactive_interface()
+
+        # Assertions
+        self.assertTrue(success)
+        self.assertEqual(mock_session.post.call_count, 3)
+
+    @patch('test_interactive_interface.SESSION')
+    def test_health_failure_stops_the_run(self, mock_session):
+        """Test that a failing health check fails the script."""
+        # Setup mocks
+        mock_session.get.return_value = FakeResponse(status_code=500)
+        mock_session.post.side_effect = fake_command_post
+
+        # Call the function
+        with redirect_stdout(io.StringIO()) as output:
+            success = interface_script.test_interactive_interface()
+
+        # Assertions
+        self.assertFalse(success)
+        self.assertIn("Server error: HTTP 500", output.getvalue())
+        mock_session.post.assert_not_called()
+
+    @patch('test_interactive_interface.SESSION')
+    def test_scan_finds_elements_split_across_chunks(self, mock_session):
+        """Test that elements straddling a chunk boundary are still found."""
+        # Setup mock with chunks small enough to split most elements
+        mock_session.get.return_value = FakeResponse(body=INTERFACE_HTML, chunk_size=7)
+
+        # Call the function
+        status_code, found = interface_script._scan_interface("http://localhost:8000")
+
+        # Assertions
+        self.assertEqual(status_code, 200)
+        self.assertGreaterEqual(len(found), interface_script._ELEMENTS_NEEDED)
+
+class TestLangChainPDFChatScript(unittest.TestCase):
+    """Test cases for test_langchain_pdf_chat.py."""
+
+    @patch('test_langchain_pdf_chat.SESSION')
+    def test_questions_reference_uploaded_document(self, mock_session):
+        """Test that chat questions send the upload's file_id instead of the content."""
+        # Setup mocks
+        mock_session.get.return_value = FakeResponse(json_data={"status": "ok", "ready": True})
+        upload_response = FakeResponse(json_data={
+            "status": "success",
+            "file_id": "text_test_langchain_rag_test.txt",
+            "text_length": 2000
+        })
+        chat_response = FakeResponse(json_data={
+            "status": "success",
+            "agent_used": "langchain_document_qa",
+            "rag_enabled": True,
+            "answer": "8GB RAM, final release May 30, 2025, retrieval and generation, "
+                      "2 seconds with 85% accuracy, split embeddings into a vector store"
+        })
+        mock_session.post.side_effect = lambda url, **kwargs: (
+            upload_response if url.endswith("/api/upload/text") else chat_response
+        )
+
+        # Call the function
+        with redirect_stdout(io.StringIO()):
+            success = pdf_chat_script.test_pdf_chat_with_langchain()
+
+        # Assertions
+        self.assertTrue(success)
+        chat_calls = [c for c in mock_session.post.call_args_list if c.args[0].endswith("/api/chat/document")]
+        self.assertEqual(len(chat_calls), 5)
+        for chat_call in chat_calls:
+            self.assertEqual(chat_call.kwargs["json"]["file_id"], "text_test_langchain_rag_test.txt")
+            self.assertNotIn("document_content", chat_call.kwargs["json"])
+
+if __name__ == '__main__':
+    unittest.main()